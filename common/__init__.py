@@ -0,0 +1,5 @@
+"""
+crawler 与 wechat 共用的轻量工具（HTML 解析、内容哈希）。
+
+仅依赖 lxml / 标准库，导入时不会加载爬虫的 HTTP 会话、OCR 进程池或 PDF 解析等重量级组件。
+"""
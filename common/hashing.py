@@ -0,0 +1,17 @@
+"""内容哈希：crawler 与 wechat 生成记录ID的唯一实现。"""
+from __future__ import annotations
+
+import hashlib  # 用于生成唯一ID
+from typing import Optional  # 类型注解
+
+
+def compute_sha256(*segments: Optional[str]) -> str:
+    """Generate a deterministic identifier from the provided text segments."""
+    # 逐段增量哈希，结果与 "\n".join(segments) 后整体哈希一致，但不拼接中间字符串
+    digest = hashlib.sha256()
+    for index, segment in enumerate(segments):
+        if index:
+            digest.update(b"\n")
+        if segment:
+            digest.update(segment.encode("utf-8"))
+    return digest.hexdigest()
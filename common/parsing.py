@@ -0,0 +1,58 @@
+"""HTML 解析辅助函数：lxml 文档树构建、CSS 选择器与可见文本提取。"""
+from __future__ import annotations
+
+from functools import lru_cache  # 选择器编译缓存
+
+from lxml import etree, html as lxml_html  # HTML解析
+from lxml.cssselect import CSSSelector  # CSS选择器编译
+
+
+# 保留注释节点：移除注释会把其两侧文本并成一个文本节点，导致按 separator 拼接时词语粘连
+HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+# 收集可见文本节点，跳过 script/style 内容（text() 本身不会选中注释）
+TEXT_XPATH = etree.XPath(
+    ".//text()[not(ancestor::script) and not(ancestor::style)]", smart_strings=False
+)
+
+
+def parse_html(html: str) -> lxml_html.HtmlElement:
+    """将HTML字符串解析为lxml文档树，空内容或解析失败时返回空的<html>节点。"""
+    if not html or not html.strip():
+        return lxml_html.Element("html")
+    try:
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return lxml_html.Element("html")
+
+
+@lru_cache(maxsize=512)
+def compile_selector(selector: str) -> CSSSelector:
+    """将CSS选择器编译为XPath表达式并缓存，各来源的选择器只需解析一次。"""
+    return CSSSelector(selector, translator="html")
+
+
+def select(node, selector: str) -> list:
+    """在节点下执行CSS选择器，返回匹配的元素列表。"""
+    if node is None or not selector:
+        return []
+    return compile_selector(selector)(node)
+
+
+def select_one(node, selector: str):
+    """返回第一个匹配CSS选择器的元素，未匹配时返回None。"""
+    matches = select(node, selector)
+    return matches[0] if matches else None
+
+
+def node_text(node, separator: str = "") -> str:
+    """提取节点下去除首尾空白后的非空文本片段，并用separator拼接。
+
+    被注释隔开的文本仍是独立片段：
+
+    >>> node_text(parse_html("<p>Hello<!-- x -->world</p><p>二<!--c-->三</p>").find("body"), " ")
+    'Hello world 二 三'
+    """
+    if node is None:
+        return ""
+    chunks = (chunk.strip() for chunk in TEXT_XPATH(node))
+    return separator.join(chunk for chunk in chunks if chunk)
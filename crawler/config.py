@@ -22,6 +22,8 @@ def _get_bool_env(name: str, default: bool) -> bool:
 CRAWL_INTERVAL = int(os.getenv("CRAWL_INTERVAL", "3600"))  # 定时抓取间隔（秒），默认1小时
 REQUEST_TIMEOUT = 30  # 单次请求超时时间（秒）
 MAX_RETRIES = 3       # 网络请求最大重试次数
+MAX_BACKOFF = 30      # 重试退避等待上限（秒）
+MAX_HTTP_CLIENTS = int(os.getenv("MAX_HTTP_CLIENTS", "100"))  # 共享HTTP会话的连接池上限（复用keep-alive连接）
 AUTO_CRAWL_ENABLED = _get_bool_env("AUTO_CRAWL_ENABLED", True)  # 是否启用定时自动抓取
 
 VECTOR_SYNC_ENABLED = _get_bool_env("VECTOR_SYNC_ENABLED", True)  # 是否自动同步爬取内容到向量库
@@ -14,7 +14,7 @@ from fastapi import FastAPI  # 导入FastAPI主类
 from contextlib import asynccontextmanager  # lifespan上下文管理器
 
 from .config import AUTO_CRAWL_ENABLED, CRAWL_INTERVAL, TARGET_SOURCES  # 配置项：自动抓取开关、间隔、目标源
-from .services import crawl_source  # 业务函数：执行实际爬取
+from .services import close_session, crawl_source, shutdown_ocr_pool  # 业务函数：执行实际爬取、关闭共享HTTP会话与OCR进程池
 
 logger = logging.getLogger(__name__)  # 获取当前模块日志对象
 
@@ -45,8 +45,9 @@ async def _periodic_crawl_loop() -> None:
         start_time = asyncio.get_running_loop().time()
         await _crawl_all_sources_once()  # 执行一次全源爬取
         elapsed = asyncio.get_running_loop().time() - start_time
-        logger.info("Crawler cycle finished in %.2f seconds. Sleeping for %s seconds...", elapsed, max(1, CRAWL_INTERVAL))
-        await asyncio.sleep(max(1, CRAWL_INTERVAL))  # 间隔等待后继续下一轮
+        sleep_for = max(1, CRAWL_INTERVAL - elapsed)  # 扣除本轮耗时，避免周期累计漂移
+        logger.info("Crawler cycle finished in %.2f seconds. Sleeping for %.2f seconds...", elapsed, sleep_for)
+        await asyncio.sleep(sleep_for)  # 间隔等待后继续下一轮
 
 
 
@@ -68,3 +69,5 @@ async def crawler_lifespan(app: FastAPI):
             await _periodic_task  # 等待任务安全退出
         logger.info("Stopped periodic crawler task")  # 停止日志
         _periodic_task = None  # 清空任务对象
+    await close_session()  # 关闭共享HTTP连接池
+    shutdown_ocr_pool()  # 关闭OCR进程池
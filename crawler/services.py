@@ -25,8 +25,8 @@
 
 依赖库：
 - curl_cffi: 异步HTTP客户端，浏览器伪装
-- BeautifulSoup: HTML解析
-- PyPDF2: PDF文本提取
+- lxml: HTML解析（cssselect提供CSS选择器）
+- pypdfium2: PDF文本提取（PDFium绑定）
 - python-docx: Word文档解析
 - pytesseract: OCR文字识别
 - PIL: 图片处理
@@ -46,19 +46,25 @@
 
 import asyncio  # 异步任务调度
 import base64   # Base64编码
-import hashlib  # 用于生成唯一ID
+import hashlib  # OCR缓存键
 import io       # 字节流处理
 import json     # 附件序列化
 import os       # 环境变量与路径
+import random   # 重试退避抖动
 import re       # 正则表达式
+import tempfile   # 附件流式落盘缓冲
+import threading  # PDFium全局锁
+from collections import OrderedDict  # OCR结果LRU缓存
+from concurrent.futures import ProcessPoolExecutor  # OCR进程池
 from datetime import datetime, timezone  # 时间处理，支持UTC
-from typing import List, Optional  # 类型注解
+from email.utils import parsedate_to_datetime  # 解析 Retry-After 的 HTTP 日期
+from typing import BinaryIO, List, Optional, Union  # 类型注解
 from urllib.parse import parse_qs, urljoin, urlparse  # URL处理
 
 
 from curl_cffi import requests as curl_requests  # 高性能异步HTTP库，支持浏览器伪装
-from PyPDF2 import PdfReader  # PDF解析
-from bs4 import BeautifulSoup  # HTML解析
+import pypdfium2 as pdfium  # PDF解析（PDFium C++绑定）
+from lxml import html as lxml_html  # HTML解析（类型标注）
 from docx import Document  # Word文档解析
 from PIL import Image  # 图片处理
 import pytesseract  # OCR文字识别
@@ -67,6 +73,8 @@ import pytesseract  # OCR文字识别
 # 导入配置项和数据模型
 from .config import (
     DETAIL_SELECTORS,      # 详情页选择器配置
+    MAX_BACKOFF,           # 重试退避上限
+    MAX_HTTP_CLIENTS,      # HTTP连接池上限
     MAX_RETRIES,           # 最大重试次数
     REQUEST_TIMEOUT,       # 请求超时时间
     TARGET_SOURCES,        # 目标网站源配置
@@ -76,6 +84,13 @@ from .config import (
 )
 from .models import Attachments, CrawlItem  # 附件和爬取结果数据结构
 from storage import database  # 统一数据库操作
+from common.hashing import compute_sha256  # 内容哈希（与 wechat 共用）
+from common.parsing import (  # HTML解析与CSS选择器（与 wechat 共用）
+    node_text as _text,
+    parse_html,
+    select as _select,
+    select_one as _select_one,
+)
 
 
 # 初始化数据库，确保表结构存在
@@ -87,42 +102,98 @@ os.environ["TESSDATA_PREFIX"] = TESSDATA_DIR
 pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
 
 
+# 来源ID -> 来源配置索引，crawl_source 按ID直接查找
+_SOURCE_INDEX: dict[str, dict] = {src["id"]: src for src in TARGET_SOURCES}
+
+
 # 列表页翻页URL正则匹配
 PAGINATION_PATTERN = re.compile(r"(list)(\d+)(\.htm)$", re.IGNORECASE)
 PARAGRAPH_CLOSE_PATTERN = re.compile(r"</p\s*>", re.IGNORECASE)
+# 常见的 年-月-日 / 年/月/日 / 年.月.日 日期格式（分隔符需一致）
+DATE_PATTERN = re.compile(r"^(\d{4})([-/.])(\d{1,2})\2(\d{1,2})$")
 
 
 
 # 全局异步HTTP会话，模拟Chrome浏览器
-ASYNC_HTTP = curl_requests.AsyncSession(impersonate="chrome120", verify=False)
+# 所有请求共用同一连接池，复用 keep-alive/HTTP2 连接，避免每次请求重新握手
+ASYNC_HTTP = curl_requests.AsyncSession(
+    impersonate="chrome120",
+    verify=False,
+    max_clients=MAX_HTTP_CLIENTS,
+    timeout=REQUEST_TIMEOUT,
+)
 
 
+def get_session() -> curl_requests.AsyncSession:
+    """返回全局共享的异步HTTP会话。"""
+    return ASYNC_HTTP
 
-async def fetch_html(
+
+async def close_session() -> None:
+    """关闭全局HTTP会话，释放连接池（在应用关闭时调用）。"""
+    await ASYNC_HTTP.close()
+
+
+
+def retry_delay(attempt: int, response=None) -> float:
+    """
+    计算第 attempt 次失败后的等待秒数。
+    429/503 响应优先遵循服务器的 Retry-After；否则使用带全抖动的指数退避，
+    打散并发任务的重试时间，避免同时重试再次触发限流。
+    """
+    if response is not None and response.status_code in (429, 503):
+        retry_after = (response.headers.get("Retry-After") or "").strip()
+        if retry_after:
+            try:
+                if retry_after.isdigit():
+                    return min(MAX_BACKOFF, float(retry_after))
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                return min(MAX_BACKOFF, max(0.0, delay))
+            except (TypeError, ValueError):
+                pass
+    return random.uniform(0, min(MAX_BACKOFF, 2 ** attempt))
+
+
+async def fetch_response(
     url: str,
     headers: dict,
     timeout: int = REQUEST_TIMEOUT,
     retries: int = MAX_RETRIES,
-) -> str:
+):
     """
-    异步获取网页HTML内容，带重试和退避机制。
+    异步GET请求，带重试和退避机制，返回响应对象（含304等非错误状态）。
     参数：url 网页地址，headers 请求头，timeout 超时，retries 最大重试。
     失败时抛出RuntimeError。
     """
     for attempt in range(retries):
+        response = None
         try:
             response = await ASYNC_HTTP.get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
-            return response.text
+            return response
         except Exception as exc:
             if attempt == retries - 1:
                 raise RuntimeError(f"Failed to fetch {url} after {retries} attempts.") from exc
-            wait_seconds = 1 + attempt
-            print(f"[WARN] attempt {attempt + 1} for {url} failed: {exc}; retry in {wait_seconds}s.")
+            wait_seconds = retry_delay(attempt, response)
+            print(f"[WARN] attempt {attempt + 1} for {url} failed: {exc}; retry in {wait_seconds:.1f}s.")
             await asyncio.sleep(wait_seconds)
     raise RuntimeError(f"Failed to fetch {url}")
 
 
+async def fetch_html(
+    url: str,
+    headers: dict,
+    timeout: int = REQUEST_TIMEOUT,
+    retries: int = MAX_RETRIES,
+) -> str:
+    """
+    异步获取网页HTML内容，带重试和退避机制。
+    参数同fetch_response。失败时抛出RuntimeError。
+    """
+    response = await fetch_response(url, headers, timeout=timeout, retries=retries)
+    return response.text
+
+
 
 async def download_binary(
     url: str,
@@ -135,6 +206,7 @@ async def download_binary(
     参数同fetch_html。失败时返回None。
     """
     for attempt in range(retries):
+        response = None
         try:
             response = await ASYNC_HTTP.get(url, headers=headers, timeout=timeout)
             response.raise_for_status()
@@ -143,8 +215,46 @@ async def download_binary(
             if attempt == retries - 1:
                 print(f"[WARN] failed to download binary {url}: {exc}")
                 return None
-            wait_seconds = 1 + attempt
-            print(f"[WARN] download attempt {attempt + 1} for {url} failed: {exc}; retry in {wait_seconds}s.")
+            wait_seconds = retry_delay(attempt, response)
+            print(f"[WARN] download attempt {attempt + 1} for {url} failed: {exc}; retry in {wait_seconds:.1f}s.")
+            await asyncio.sleep(wait_seconds)
+    return None
+
+
+SPOOL_MAX_MEMORY = 5 * 1024 * 1024  # 附件缓冲超过5MB后转存临时文件
+
+
+async def download_to_spooled(
+    url: str,
+    headers: dict,
+    timeout: int = REQUEST_TIMEOUT,
+    retries: int = MAX_RETRIES,
+) -> Optional[tempfile.SpooledTemporaryFile]:
+    """
+    异步流式下载附件（PDF、Word等）到 SpooledTemporaryFile，带重试。
+    小文件留在内存，大文件自动落盘，避免整份附件常驻内存。
+    参数同fetch_html。成功时返回已定位到开头的文件对象（调用方负责关闭），失败或内容为空时返回None。
+    """
+    for attempt in range(retries):
+        response = None
+        buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        try:
+            async with ASYNC_HTTP.stream("GET", url, headers=headers, timeout=timeout) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_content():
+                    buffer.write(chunk)
+            if not buffer.tell():
+                buffer.close()
+                return None
+            buffer.seek(0)
+            return buffer
+        except Exception as exc:
+            buffer.close()
+            if attempt == retries - 1:
+                print(f"[WARN] failed to download binary {url}: {exc}")
+                return None
+            wait_seconds = retry_delay(attempt, response)
+            print(f"[WARN] download attempt {attempt + 1} for {url} failed: {exc}; retry in {wait_seconds:.1f}s.")
             await asyncio.sleep(wait_seconds)
     return None
 
@@ -180,36 +290,73 @@ def parse_list(html: str, selectors: dict, base_url: str) -> List[dict]:
     返回：包含title、date、url、type的字典列表。
     """
     html_with_newlines = PARAGRAPH_CLOSE_PATTERN.sub("</p>\n", html)
-    soup = BeautifulSoup(html_with_newlines, "lxml")
-    items = soup.select(selectors["item_container"])
+    tree = parse_html(html_with_newlines)
+    items = _select(tree, selectors["item_container"])
     results = []
     for item in items:
-        date_el = item.select_one(selectors["date"])
-        title_el = item.select_one(selectors["title"])
+        date_el = _select_one(item, selectors["date"])
+        title_el = _select_one(item, selectors["title"])
         
         # 处理 URL 选择器为空的情况（链接在容器本身）
         if not selectors.get("url"):
             url_el = item
         else:
-            url_el = item.select_one(selectors["url"])
+            url_el = _select_one(item, selectors["url"])
 
         type_selector = selectors.get("type")
-        type_el = item.select_one(type_selector) if type_selector else None
+        type_el = _select_one(item, type_selector) if type_selector else None
 
         full_url = normalize_url(base_url, url_el)
 
         results.append(
             {
-                "title": title_el.get_text(strip=True) if title_el else None,
-                "date": date_el.get_text(strip=True) if date_el else None,
+                "title": _text(title_el) if title_el is not None else None,
+                "date": _text(date_el) if date_el is not None else None,
                 "url": full_url,
-                "type": type_el.get_text(strip=True) if type_el else None,
+                "type": _text(type_el) if type_el is not None else None,
             }
         )
     return results
 
 
 
+# 列表页条件请求缓存：(URL, 选择器指纹) -> (ETag, Last-Modified, 解析结果)
+# 选择器变化时指纹不同，自动失效
+_LIST_CACHE: dict[tuple[str, str], tuple[Optional[str], Optional[str], List[dict]]] = {}
+
+
+async def fetch_list_entries(list_url: str, source_cfg: dict) -> List[dict]:
+    """
+    抓取并解析列表页，带 ETag/Last-Modified 条件请求。
+    服务器返回304时直接复用上次的解析结果，跳过下载与解析。
+    失败时抛出RuntimeError。
+    """
+    selectors = source_cfg["selectors"]
+    cache_key = (list_url, json.dumps(selectors, sort_keys=True))
+    cached = _LIST_CACHE.get(cache_key)
+
+    headers = dict(source_cfg["headers"])
+    if cached:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    response = await fetch_response(list_url, headers)
+    if response.status_code == 304 and cached:
+        return list(cached[2])
+
+    entries = await asyncio.to_thread(parse_list, response.text, selectors, source_cfg["base_url"])
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _LIST_CACHE[cache_key] = (etag, last_modified, entries)
+    else:
+        _LIST_CACHE.pop(cache_key, None)
+    return list(entries)
+
+
 def build_paginated_urls(list_url: str, max_pages: int) -> List[str]:
     """
     生成所有翻页的列表URL（如list1.htm、list2.htm...），支持最大页数。
@@ -217,17 +364,14 @@ def build_paginated_urls(list_url: str, max_pages: int) -> List[str]:
     if max_pages <= 1:
         return [list_url]
 
-    urls = [list_url]
+    pages = range(2, max_pages + 1)
     match = PAGINATION_PATTERN.search(list_url)
-    for page in range(2, max_pages + 1):
-        if match:
-            prefix = list_url[: match.start()]
-            suffix = match.group(3)
-            urls.append(f"{prefix}list{page}{suffix}")
-        else:
-            separator = "&" if "?" in list_url else "?"
-            urls.append(f"{list_url}{separator}page={page}")
-    return urls
+    if match:
+        prefix = list_url[: match.start()]
+        suffix = match.group(3)
+        return [list_url] + [f"{prefix}list{page}{suffix}" for page in pages]
+    separator = "&" if "?" in list_url else "?"
+    return [list_url] + [f"{list_url}{separator}page={page}" for page in pages]
 
 
 
@@ -241,6 +385,19 @@ def parse_publish_time(date_str: Optional[str]) -> datetime:
     # 确保转换为字符串，处理 API 返回整数的情况
     date_str = str(date_str).strip()
 
+    # 快速路径：绝大多数列表页日期为 YYYY-MM-DD 等数字格式，直接构造，免去 strptime 开销
+    date_match = DATE_PATTERN.match(date_str)
+    if date_match:
+        try:
+            return datetime(
+                int(date_match.group(1)),
+                int(date_match.group(3)),
+                int(date_match.group(4)),
+                tzinfo=timezone.utc,
+            )
+        except ValueError:
+            pass
+
     # 处理纯数字时间戳 (如 1618379815000)
     if date_str.isdigit():
         try:
@@ -292,9 +449,8 @@ def parse_publish_time(date_str: Optional[str]) -> datetime:
             year = now.year
         else:
             year = now.year - 1
-        date_str_full = f"{year}-{month:02d}-{day:02d}"
         try:
-            return datetime.strptime(date_str_full, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            return datetime(year, month, day, tzinfo=timezone.utc)
         except ValueError:
             pass
 
@@ -311,44 +467,91 @@ def parse_publish_time(date_str: Optional[str]) -> datetime:
 
 
 
-def extract_text_content(soup: BeautifulSoup, selector_cfg: Optional[dict]) -> str:
+def extract_text_content(tree: lxml_html.HtmlElement, selector_cfg: Optional[dict]) -> str:
     """
     按配置提取详情页正文内容。
     支持多节点聚合，返回纯文本。
     """
     if not selector_cfg:
         return ""
-    container = soup.select_one(selector_cfg.get("item_container", ""))
-    if not container:
+    container = _select_one(tree, selector_cfg.get("item_container", ""))
+    if container is None:
         return ""
 
-    # 移除 script 和 style 标签，防止提取到代码
-    for script in container(["script", "style"]):
-        script.decompose()
-
+    # 不删除 script/style 节点：_text 已跳过其文本，
+    # 而 drop_tree() 会把节点 tail 并入前一段文本，造成词语粘连
     content_selector = selector_cfg.get("content")
     if content_selector:
-        # content_selector 可能选中多个区域 (返回 ResultSet)
-        content_nodes = container.select(content_selector)
+        # content_selector 可能选中多个区域 (返回元素列表)
+        content_nodes = _select(container, content_selector)
         
         # 收集所有区域内的 <p> 标签
         all_p_nodes = []
         for node in content_nodes:
-            all_p_nodes.extend(node.select("p"))
+            all_p_nodes.extend(_select(node, "p"))
             
         if all_p_nodes:
-            text_chunks = [p.get_text(" ", strip=True) for p in all_p_nodes if p]
+            text_chunks = [_text(p, " ") for p in all_p_nodes]
         else:
             # 如果没有 <p> 标签，直接使用 content_nodes 的文本
-            text_chunks = [node.get_text(" ", strip=True) for node in content_nodes if node]
+            text_chunks = [_text(node, " ") for node in content_nodes]
     else:
         # 如果没有配置 content_selector，直接使用 container 的文本
-        text_chunks = [container.get_text(" ", strip=True)]
+        text_chunks = [_text(container, " ")]
         
     return "\n".join(filter(None, text_chunks))
 
 
 
+def _ocr_worker(image_bytes: bytes, tesseract_cmd: str, tessdata_dir: str) -> Optional[str]:
+    """
+    在OCR子进程中识别图片文字（模块级函数，可被pickle）。
+    识别失败时返回None。
+    """
+    try:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        config = f'--tessdata-dir "{tessdata_dir}"' if tessdata_dir else None
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            text = pytesseract.image_to_string(img, lang="chi_sim+eng", config=config)
+        return text.strip()
+    except (pytesseract.TesseractError, OSError) as exc:
+        print(f"[WARN] OCR worker error: {exc}")
+        return None
+
+
+# OCR进程池，首次使用时创建，使多张图片的解码与识别真正跨核并行
+OCR_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def get_ocr_pool() -> ProcessPoolExecutor:
+    """返回全局OCR进程池，必要时惰性创建。"""
+    global OCR_POOL
+    if OCR_POOL is None:
+        OCR_POOL = ProcessPoolExecutor(max_workers=min(os.cpu_count() or 2, 4))
+    return OCR_POOL
+
+
+def shutdown_ocr_pool() -> None:
+    """关闭OCR进程池（在应用关闭时调用）。"""
+    global OCR_POOL
+    if OCR_POOL is not None:
+        OCR_POOL.shutdown(wait=False, cancel_futures=True)
+        OCR_POOL = None
+
+
+# 进程内OCR结果缓存（图片SHA-256 -> 文本），位于SQLite缓存之前，按LRU淘汰
+OCR_MEMO_SIZE = 2048
+_OCR_MEMO: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _remember_ocr(key: str, text: str) -> None:
+    """写入进程内OCR缓存，超出容量时淘汰最久未用的条目。"""
+    _OCR_MEMO[key] = text
+    _OCR_MEMO.move_to_end(key)
+    if len(_OCR_MEMO) > OCR_MEMO_SIZE:
+        _OCR_MEMO.popitem(last=False)
+
+
 async def perform_ocr_from_url(image_url: str, headers: dict) -> str:
     """
     下载图片并用pytesseract进行OCR识别。
@@ -361,61 +564,95 @@ async def perform_ocr_from_url(image_url: str, headers: dict) -> str:
     if not image_bytes:
         return ""
 
-    def _ocr() -> str:
-        try:
-            pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
-            config_parts = []
-            if TESSDATA_DIR:
-                config_parts.append(f'--tessdata-dir "{TESSDATA_DIR}"')
-            config = " ".join(config_parts) or None
-            with Image.open(io.BytesIO(image_bytes)) as img:
-                text = pytesseract.image_to_string(img, lang="chi_sim+eng", config=config)
-            return text.strip()
-        except (pytesseract.TesseractError, OSError) as exc:
-            print(f"[WARN] OCR failed for {image_url}: {exc}")
-            return ""
+    # 同一来源的页眉/页脚/二维码等图片反复出现，按内容哈希复用已有识别结果
+    key = hashlib.sha256(image_bytes).hexdigest()
+    cached = _OCR_MEMO.get(key)
+    if cached is None:
+        cached = await asyncio.to_thread(database.get_ocr_text, key)
+    if cached is not None:
+        _remember_ocr(key, cached)
+        return cached
+
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(
+        get_ocr_pool(), _ocr_worker, image_bytes, TESSERACT_CMD, TESSDATA_DIR
+    )
+    if text is None:
+        # 识别失败不写缓存，下次仍会重试
+        print(f"[WARN] OCR failed for {image_url}")
+        return ""
+    _remember_ocr(key, text)
+    await asyncio.to_thread(database.put_ocr_text, key, text)
+    return text
+
 
-    return await asyncio.to_thread(_ocr)
+MAX_CONCURRENT_PAGE_ASSETS = 4  # 单个详情页内并发OCR/附件下载上限
 
 
 async def extract_image_texts(
-    soup: BeautifulSoup, selector_cfg: Optional[dict], base_url: str, headers: dict
+    tree: lxml_html.HtmlElement, selector_cfg: Optional[dict], base_url: str, headers: dict
 ) -> List[str]:
     """Collect OCR text for every image that matches the configured selector."""
     if not selector_cfg:
         return []
-    container = soup.select_one(selector_cfg.get("item_container", ""))
-    if not container:
+    container = _select_one(tree, selector_cfg.get("item_container", ""))
+    if container is None:
         return []
     image_selector = selector_cfg.get("images")
     if not image_selector:
         return []
-    texts: List[str] = []
-    for img in container.select(image_selector):
-        src = normalize_url(base_url, img.get("src"))
-        if not src:
-            continue
-        ocr_text = await perform_ocr_from_url(src, headers)
-        if ocr_text:
-            texts.append(ocr_text)
-    return texts
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGE_ASSETS)
 
+    async def ocr_one(src: str) -> str:
+        async with semaphore:
+            return await perform_ocr_from_url(src, headers)
 
-def parse_pdf_bytes(file_bytes: bytes) -> str:
-    """Return concatenated text for all PDF pages (skipping empty extractions)."""
-    reader = PdfReader(io.BytesIO(file_bytes))
-    texts = [page.extract_text() or "" for page in reader.pages]
+    srcs = [
+        src for img in _select(container, image_selector)
+        if (src := normalize_url(base_url, img.get("src")))
+    ]
+    texts = await asyncio.gather(*(ocr_one(src) for src in srcs))
+    return [text for text in texts if text]
+
+
+# PDFium 库本身不是线程安全的，多个 to_thread 调用需串行访问
+_PDFIUM_LOCK = threading.Lock()
+
+
+def parse_pdf_bytes(source: Union[bytes, BinaryIO]) -> str:
+    """Return concatenated text for all PDF pages (skipping empty extractions).
+
+    Accepts raw bytes or a seekable binary file object.
+    """
+    # PDFium 以缓冲区方式读取时需要 readinto（旧版 SpooledTemporaryFile 未实现），否则整体读入
+    if not isinstance(source, bytes) and not hasattr(source, "readinto"):
+        source = source.read()
+    texts: List[str] = []
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            for page in pdf:
+                try:
+                    textpage = page.get_textpage()
+                    try:
+                        texts.append(textpage.get_text_range() or "")
+                    finally:
+                        textpage.close()
+                finally:
+                    page.close()
+        finally:
+            pdf.close()
     return "\n".join(filter(None, texts))
 
 
-def parse_docx_bytes(file_bytes: bytes) -> str:
-    """Join all paragraph texts from a DOCX binary payload."""
-    document = Document(io.BytesIO(file_bytes))
+def parse_docx_bytes(source: Union[bytes, BinaryIO]) -> str:
+    """Join all paragraph texts from a DOCX payload (raw bytes or a seekable binary file object)."""
+    document = Document(io.BytesIO(source) if isinstance(source, bytes) else source)
     return "\n".join(p.text for p in document.paragraphs if p.text)
 
 
 async def extract_file_texts(
-    soup: BeautifulSoup,
+    tree: lxml_html.HtmlElement,
     selector_cfg: Optional[dict],
     base_url: str,
     headers: dict,
@@ -424,43 +661,51 @@ async def extract_file_texts(
     """Download and parse attachment texts for the allowed extensions."""
     if not selector_cfg:
         return []
-    container = soup.select_one(selector_cfg.get("item_container", ""))
-    if not container:
+    container = _select_one(tree, selector_cfg.get("item_container", ""))
+    if container is None:
         return []
     file_selector = selector_cfg.get("files")
     if not file_selector:
         return []
 
-    attachments: List[Attachments] = []
-    for link in container.select(file_selector):
+    # ensure Referer is set to the detail page (base_url) to satisfy anti-hotlink checks
+    file_headers = (headers or {}).copy()
+    file_headers.setdefault("Referer", base_url)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGE_ASSETS)
+
+    async def fetch_one(link) -> Optional[Attachments]:
         file_url = normalize_url(base_url, link)
         if not file_url:
-            continue
-        if not file_url.lower().endswith(allowed_ext):
-            continue
-        filename = link.get_text(strip=True) or "attachment"
-        # ensure Referer is set to the detail page (base_url) to satisfy anti-hotlink checks
-        file_headers = (headers or {}).copy()
-        file_headers.setdefault("Referer", base_url)
-        binary = await download_binary(file_url, file_headers)
-        if not binary:
-            continue
+            return None
+        lower_url = file_url.lower()
+        if not lower_url.endswith(allowed_ext):
+            return None
+        filename = _text(link) or "attachment"
+        async with semaphore:
+            spooled = await download_to_spooled(file_url, file_headers)
+        if spooled is None:
+            return None
 
-        if file_url.lower().endswith(".pdf"):
-            text = await asyncio.to_thread(parse_pdf_bytes, binary)
-            mime = "application/pdf"
-        elif file_url.lower().endswith(".docx"):
-            text = await asyncio.to_thread(parse_docx_bytes, binary)
-            mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        else:
-            continue
+        try:
+            if lower_url.endswith(".pdf"):
+                text = await asyncio.to_thread(parse_pdf_bytes, spooled)
+                mime = "application/pdf"
+            elif lower_url.endswith(".docx"):
+                text = await asyncio.to_thread(parse_docx_bytes, spooled)
+                mime = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            else:
+                return None
+        finally:
+            spooled.close()
 
-        attachments.append(Attachments(url=file_url, filename=filename, mime_type=mime, text=text))
-    return attachments
+        return Attachments(url=file_url, filename=filename, mime_type=mime, text=text)
+
+    results = await asyncio.gather(*(fetch_one(link) for link in _select(container, file_selector)))
+    return [att for att in results if att is not None]
 
 
 async def extract_embedded_pdf_attachment(
-    soup: BeautifulSoup, selector_cfg: Optional[dict], base_url: str, headers: dict
+    tree: lxml_html.HtmlElement, selector_cfg: Optional[dict], base_url: str, headers: dict
 ) -> List[Attachments]:
     """Handle sites that embed PDFs via viewer iframes instead of direct links."""
     if not selector_cfg:
@@ -468,8 +713,8 @@ async def extract_embedded_pdf_attachment(
     viewer_selector = selector_cfg.get("viewer")
     if not viewer_selector:
         return []
-    viewer_el = soup.select_one(viewer_selector)
-    if not viewer_el:
+    viewer_el = _select_one(tree, viewer_selector)
+    if viewer_el is None:
         return []
 
     # Try several common attribute names for embedded pdf/source
@@ -484,7 +729,8 @@ async def extract_embedded_pdf_attachment(
         return []
 
     # If src points to a viewer page with ?file=..., extract the file param
-    if "?file=" in src or "viewer.html" in src:
+    is_viewer = "?file=" in src or "viewer.html" in src
+    if is_viewer:
         full_src = normalize_url(base_url, src)
         if not full_src:
             return []
@@ -501,8 +747,8 @@ async def extract_embedded_pdf_attachment(
         return []
     # 如果有 viewer 页面 URL，先访问 viewer 页面以建立会话并让服务器下发必要的 cookie/头
     viewer_page_url = None
-    if "?file=" in src or "viewer.html" in src:
-        viewer_page_url = normalize_url(base_url, src)
+    if is_viewer:
+        viewer_page_url = full_src
         try:
             await fetch_html(viewer_page_url, headers)
         except Exception:
@@ -521,10 +767,13 @@ async def extract_embedded_pdf_attachment(
     except Exception:
         pass
 
-    binary = await download_binary(pdf_url, pdf_headers)
-    if not binary:
+    spooled = await download_to_spooled(pdf_url, pdf_headers)
+    if spooled is None:
         return []
-    text = await asyncio.to_thread(parse_pdf_bytes, binary)
+    try:
+        text = await asyncio.to_thread(parse_pdf_bytes, spooled)
+    finally:
+        spooled.close()
     return [
         Attachments(
             url=pdf_url,
@@ -536,7 +785,7 @@ async def extract_embedded_pdf_attachment(
 
 
 async def extract_script_embedded_pdf_attachments(
-    soup: BeautifulSoup, selector_cfg: Optional[dict], base_url: str, headers: dict
+    tree: lxml_html.HtmlElement, selector_cfg: Optional[dict], base_url: str, headers: dict
 ) -> List[Attachments]:
     """Handle sites that embed PDFs via script"""
     if not selector_cfg:
@@ -544,12 +793,12 @@ async def extract_script_embedded_pdf_attachments(
     script_selector = selector_cfg.get("download_link")
     if not script_selector:
         return []
-    scripts = soup.select(script_selector)
+    scripts = _select(tree, script_selector)
     if not scripts:
         return []
     urls: List[str] = []
     for s in scripts:
-        content = s.string or s.get_text() or ""
+        content = s.text or ""
         m = re.search(r"showVsbpdfIframe\([\"']([^\"']+?\.pdf)[\"']", content)
         if m:
             url = normalize_url(base_url, m.group(1))
@@ -561,13 +810,16 @@ async def extract_script_embedded_pdf_attachments(
     for url in urls:
         link_headers = (headers or {}).copy()
         link_headers.setdefault("Referer", base_url)
-        binary = await download_binary(url, link_headers)
-        if not binary:
+        spooled = await download_to_spooled(url, link_headers)
+        if spooled is None:
             attachments.append(
                 Attachments(url=url, filename=url.split("/")[-1], mime_type="application/pdf", text="")
             )
             continue
-        text = await asyncio.to_thread(parse_pdf_bytes, binary)
+        try:
+            text = await asyncio.to_thread(parse_pdf_bytes, spooled)
+        finally:
+            spooled.close()
         attachments.append(
             Attachments(url=url, filename=url.split("/")[-1], mime_type="application/pdf", text=text)
         )
@@ -576,12 +828,14 @@ async def extract_script_embedded_pdf_attachments(
 
 def aggregate_content(text: str, image_texts: List[str], attachment_texts: List[str]) -> str:
     """Merge base content, OCR outputs, and attachment snippets into one blob."""
-    chunks = [chunk for chunk in [text] if chunk]
+    parts: List[str] = []
+    if text:
+        parts.append(text)
     if image_texts:
-        chunks.append("\n".join(image_texts))
+        parts.append("\n".join(image_texts))
     if attachment_texts:
-        chunks.append("\n".join(attachment_texts))
-    return "\n\n".join(chunks)
+        parts.append("\n".join(attachment_texts))
+    return "\n\n".join(parts)
 
 
 def build_attachment_text_snippet(attachment: Attachments) -> str:
@@ -590,12 +844,6 @@ def build_attachment_text_snippet(attachment: Attachments) -> str:
     return f"【附件：{title}】\n{attachment.text or ''}"
 
 
-def compute_sha256(*segments: Optional[str]) -> str:
-    """Generate a deterministic identifier from the provided text segments."""
-    payload = "\n".join(segment or "" for segment in segments)
-    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
-
-
 def parse_wechat_article(html: str) -> tuple[str, List[Attachments]]:
     """Parse WeChat official account article."""
     # Delegate to the robust implementation in wechat module
@@ -636,27 +884,36 @@ def resolve_detail_selector(detail_url: str) -> Optional[dict]:
     return DETAIL_SELECTORS[0]
 
 
+def parse_detail_text(
+    html: str, selector_cfg: Optional[dict]
+) -> tuple[lxml_html.HtmlElement, str]:
+    """Parse a detail page and extract its body text (CPU-bound, safe to run in a worker thread)."""
+    tree = parse_html(html)
+    return tree, extract_text_content(tree, selector_cfg)
+
+
 async def parse_detail_page(html: str, detail_url: str, headers: dict) -> tuple[str, List[Attachments]]:
     """Parse a detail page and return aggregated text plus attachment metadata."""
     if "mp.weixin.qq.com" in detail_url:
-        return parse_wechat_article(html)
+        return await asyncio.to_thread(parse_wechat_article, html)
 
-    soup = BeautifulSoup(html, "lxml")
     selector_cfg = resolve_detail_selector(detail_url) or {}
-
-    text_content = extract_text_content(soup, selector_cfg.get("text_selector"))
-    image_texts = await extract_image_texts(soup, selector_cfg.get("img_selector"), detail_url, headers)
+    # 建树与正文提取是纯CPU操作，放到线程中执行，避免阻塞其他详情页的网络IO
+    tree, text_content = await asyncio.to_thread(
+        parse_detail_text, html, selector_cfg.get("text_selector")
+    )
+    image_texts = await extract_image_texts(tree, selector_cfg.get("img_selector"), detail_url, headers)
     pdf_attachments = await extract_file_texts(
-        soup, selector_cfg.get("pdf_selector"), detail_url, headers, allowed_ext=(".pdf",)
+        tree, selector_cfg.get("pdf_selector"), detail_url, headers, allowed_ext=(".pdf",)
     )
     doc_attachments = await extract_file_texts(
-        soup, selector_cfg.get("doc_selector"), detail_url, headers, allowed_ext=(".docx",)
+        tree, selector_cfg.get("doc_selector"), detail_url, headers, allowed_ext=(".docx",)
     )
     embedded_pdf = await extract_embedded_pdf_attachment(
-        soup, selector_cfg.get("embedded_pdf_selector"), detail_url, headers
+        tree, selector_cfg.get("embedded_pdf_selector"), detail_url, headers
     )
     embedded_pdf_script = await extract_script_embedded_pdf_attachments(
-        soup, selector_cfg.get("embedded_pdf_selector"), detail_url, headers
+        tree, selector_cfg.get("embedded_pdf_selector"), detail_url, headers
     )
 
     attachments = pdf_attachments + doc_attachments + embedded_pdf + embedded_pdf_script
@@ -666,6 +923,7 @@ async def parse_detail_page(html: str, detail_url: str, headers: dict) -> tuple[
 
 
 MAX_CONCURRENT_DETAIL_REQUESTS = 5
+MAX_CONCURRENT_LIST_REQUESTS = 5
 
 
 def get_max_page(html: str) -> int:
@@ -673,16 +931,16 @@ def get_max_page(html: str) -> int:
     从HTML中解析最大页码。
     优先查找 .p_no 元素，提取其中的数字。
     """
-    soup = BeautifulSoup(html, "lxml")
+    tree = parse_html(html)
     # 查找所有 .p_no 元素
-    page_nodes = soup.select(".p_no")
+    page_nodes = _select(tree, ".p_no")
     if not page_nodes:
         # 尝试查找常见的翻页容器
-        page_nodes = soup.select(".pagination a, .pages a, .pb_sys_common a")
+        page_nodes = _select(tree, ".pagination a, .pages a, .pb_sys_common a")
     
     max_page = 1
     for node in page_nodes:
-        text = node.get_text(strip=True)
+        text = _text(node)
         # 提取数字
         match = re.search(r"(\d+)", text)
         if match:
@@ -697,7 +955,7 @@ def get_max_page(html: str) -> int:
 
 async def crawl_source(source_id: str) -> List[CrawlItem]:
     """Crawl a configured list page and return normalized CrawlItem records."""
-    source_cfg = next((src for src in TARGET_SOURCES if src["id"] == source_id), None)
+    source_cfg = _SOURCE_INDEX.get(source_id)
     if not source_cfg:
         raise ValueError(f"Unknown source id: {source_id}")
 
@@ -733,11 +991,13 @@ async def crawl_source(source_id: str) -> List[CrawlItem]:
             # 获取第一页 HTML
             first_page_html = await fetch_html(list_url, source_cfg["headers"])
             # 解析第一页条目
-            first_page_entries = parse_list(first_page_html, source_cfg["selectors"], source_cfg["base_url"])
+            first_page_entries = await asyncio.to_thread(
+                parse_list, first_page_html, source_cfg["selectors"], source_cfg["base_url"]
+            )
             entries.extend(first_page_entries)
             
             # 获取最大页码
-            max_p = get_max_page(first_page_html)
+            max_p = await asyncio.to_thread(get_max_page, first_page_html)
             print(f"[INFO] Detected max page for {source_id}: {max_p}")
             
             # 生成后续页码 URL (从 max_p - 1 倒序抓取)
@@ -757,8 +1017,7 @@ async def crawl_source(source_id: str) -> List[CrawlItem]:
                     # 构造 URL: .../xwdt/{page_num}.htm
                     next_url = f"{base_name}/{page_num}.{ext}"
                     try:
-                        html = await fetch_html(next_url, source_cfg["headers"])
-                        page_entries = parse_list(html, source_cfg["selectors"], source_cfg["base_url"])
+                        page_entries = await fetch_list_entries(next_url, source_cfg)
                         if page_entries:
                             entries.extend(page_entries)
                         else:
@@ -771,40 +1030,61 @@ async def crawl_source(source_id: str) -> List[CrawlItem]:
             print(f"[WARN] Failed to fetch initial list page {list_url}: {exc}")
 
     else:
-        # Forward 模式 (默认)
+        # Forward 模式 (默认)：各列表页互不依赖，并发抓取解析后按页码顺序合并
         list_urls = build_paginated_urls(source_cfg["list_url"], max_pages)
-        for page_number, list_url in enumerate(list_urls, start=1):
-            try:
-                list_html = await fetch_html(list_url, source_cfg["headers"])
-            except RuntimeError as exc:
-                print(f"[WARN] skip list page {list_url}: {exc}")
+        list_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LIST_REQUESTS)
+
+        async def fetch_list_page(list_url: str) -> List[dict]:
+            async with list_semaphore:
+                return await fetch_list_entries(list_url, source_cfg)
+
+        list_results = await asyncio.gather(
+            *(fetch_list_page(list_url) for list_url in list_urls), return_exceptions=True
+        )
+        for page_number, (list_url, page_entries) in enumerate(zip(list_urls, list_results), start=1):
+            if isinstance(page_entries, Exception):
+                print(f"[WARN] skip list page {list_url}: {page_entries}")
                 continue
-            page_entries = parse_list(list_html, source_cfg["selectors"], source_cfg["base_url"])
             if not page_entries:
                 print(f"[INFO] list page {page_number} returned no entries. Stopping pagination.")
                 break
             entries.extend(page_entries)
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT_DETAIL_REQUESTS)
-
-    async def process_entry(entry: dict) -> Optional[CrawlItem]:
+    # 置顶公告等会在多个列表页重复出现，按URL去重，避免重复抓取同一详情页
+    seen_urls: set[str] = set()
+    unique_entries = []
+    for entry in entries:
+        url = entry.get("url")
+        if url and url not in seen_urls:
+            seen_urls.add(url)
+            unique_entries.append(entry)
+    if len(unique_entries) < len(entries):
+        print(f"[INFO] Dropped {len(entries) - len(unique_entries)} duplicate/empty-URL entries for {source_id}.")
+    entries = unique_entries
+
+    # 预先加载本源已入库的ID，已抓取过的条目直接在内存中跳过，无需逐条查库
+    known_ids = await asyncio.to_thread(database.get_all_ids, source_cfg["id"])
+
+    async def process_entry(entry: dict) -> Optional[tuple[tuple[str, str, dict], CrawlItem]]:
         detail_url = entry.get("url")
         if not detail_url:
             return None
         item_id = compute_sha256(detail_url)
+        if item_id in known_ids:
+            return None
+        # 集合未命中时仍查库一次，以覆盖按 URL 或其他来源入库的记录
         exists = await asyncio.to_thread(database.record_exists, item_id, detail_url)
         if exists:
             return None
         try:
-            async with semaphore:
-                # 动态调整 Headers (如移除不匹配的 Host)
-                req_headers = source_cfg["headers"].copy()
-                target_host = urlparse(detail_url).netloc
-                cfg_host = req_headers.get("host") or req_headers.get("Host")
-                if cfg_host and cfg_host != target_host:
-                    req_headers.pop("host", None)
-                    req_headers.pop("Host", None)
-
-                detail_html = await fetch_html(detail_url, req_headers)
+            # 动态调整 Headers (如移除不匹配的 Host)
+            req_headers = source_cfg["headers"].copy()
+            target_host = urlparse(detail_url).netloc
+            cfg_host = req_headers.get("host") or req_headers.get("Host")
+            if cfg_host and cfg_host != target_host:
+                req_headers.pop("host", None)
+                req_headers.pop("Host", None)
+
+            detail_html = await fetch_html(detail_url, req_headers)
             
             # 使用 detail_url 作为 base_url 以正确解析相对路径
             content, attachments = await parse_detail_page(detail_html, detail_url, req_headers)
@@ -839,13 +1119,8 @@ async def crawl_source(source_id: str) -> List[CrawlItem]:
             "publish_time": publish_time.strftime("%Y-%m-%d"),
             "attachments": attachments_payload,
         }
-        # 本地存储文档内容及元数据
-        try:
-            await asyncio.to_thread(database.store_document, item_id, content, metadata)
-        except Exception as exc:
-            print(f"[WARN] Failed to store document {item_id} in local SQLite: {exc}")
-
-        return CrawlItem(
+        # 入库行与返回结果一起交给调用方，由其统一批量写入
+        item = CrawlItem(
             id=item_id,
             title=entry.get("title") or "",
             content=content,
@@ -855,17 +1130,45 @@ async def crawl_source(source_id: str) -> List[CrawlItem]:
             attachments=attachments or None,
             extra_meta={"category": entry.get("type")},
         )
+        return (item_id, content, metadata), item
+
+    # 固定数量的 worker 从队列中取条目处理，并发度由 worker 数决定，
+    # 条目在被取走前只是队列中的数据，不会为每条都创建一个 Task
+    queue: asyncio.Queue = asyncio.Queue()
+    for index, entry in enumerate(entries):
+        queue.put_nowait((index, entry))
+    results: list = [None] * len(entries)
+
+    async def worker() -> None:
+        while True:
+            try:
+                index, entry = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                results[index] = await process_entry(entry)
+            except Exception as exc:
+                results[index] = exc
 
-    tasks = [process_entry(entry) for entry in entries]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    worker_count = min(MAX_CONCURRENT_DETAIL_REQUESTS, len(entries))
+    await asyncio.gather(*(worker() for _ in range(worker_count)))
 
     crawl_items: List[CrawlItem] = []
+    rows: List[tuple[str, str, dict]] = []
     for result in results:
         if isinstance(result, Exception):
             print(f"[WARN] detail task failed: {result}")
             continue
         if result:
-            crawl_items.append(result)
+            row, item = result
+            rows.append(row)
+            crawl_items.append(item)
+
+    # 本地存储文档内容及元数据：整批在一个事务内写入
+    try:
+        await asyncio.to_thread(database.store_documents_bulk, rows)
+    except Exception as exc:
+        print(f"[WARN] Failed to store {len(rows)} documents in local SQLite: {exc}")
 
     # 终端显示提醒
     if crawl_items:
@@ -882,8 +1185,10 @@ def fetch_detail(parsed_lists, headers):
 def base64_encode(s):
     """
     辅助函数: 将字符串转换为 Base64 编码。
+    已是字节串时直接编码；输出只含 ASCII 字符，用 ascii 解码即可。
     """
-    return base64.b64encode(str(s).encode('utf-8')).decode('utf-8')
+    raw = s if isinstance(s, (bytes, bytearray, memoryview)) else str(s).encode('utf-8')
+    return base64.b64encode(raw).decode('ascii')
 
 
 async def fetch_api(
@@ -904,6 +1209,7 @@ async def fetch_api(
         headers["Content-Type"] = "application/x-www-form-urlencoded; charset=UTF-8"
 
     for attempt in range(retries):
+        response = None
         try:
             response = await ASYNC_HTTP.post(url, data=encoded_data, headers=headers, timeout=timeout)
             response.raise_for_status()
@@ -911,8 +1217,8 @@ async def fetch_api(
         except Exception as exc:
             if attempt == retries - 1:
                 raise RuntimeError(f"Failed to fetch API {url} after {retries} attempts.") from exc
-            wait_seconds = 1 + attempt
-            print(f"[WARN] API attempt {attempt + 1} for {url} failed: {exc}; retry in {wait_seconds}s.")
+            wait_seconds = retry_delay(attempt, response)
+            print(f"[WARN] API attempt {attempt + 1} for {url} failed: {exc}; retry in {wait_seconds:.1f}s.")
             await asyncio.sleep(wait_seconds)
     raise RuntimeError(f"Failed to fetch API {url}")
 
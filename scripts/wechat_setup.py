@@ -32,7 +32,7 @@ except Exception:
     wechat_auth = None
 
 from wechat import config as wechat_config
-from wechat.services import get_fakeid_by_name, crawl_wechat_source
+from wechat.services import close_session, get_fakeid_by_name, crawl_wechat_source
 
 CFG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "cfg")
 SESSION_PATH = getattr(wechat_config, "SESSION_FILE", os.path.join(CFG_DIR, "session.json"))
@@ -169,13 +169,17 @@ def _resolve_source_name(source_id: str) -> str:
 
 async def maybe_crawl_sources(source_ids: List[str]):
     summary: List[Dict[str, Any]] = []
-    for sid in source_ids:
-        display_name = _resolve_source_name(sid)
-        try:
-            items = await crawl_wechat_source(sid)
-            summary.append({"name": display_name, "count": len(items)})
-        except Exception as exc:
-            summary.append({"name": display_name, "error": str(exc)})
+    try:
+        for sid in source_ids:
+            display_name = _resolve_source_name(sid)
+            try:
+                items = await crawl_wechat_source(sid)
+                summary.append({"name": display_name, "count": len(items)})
+            except Exception as exc:
+                summary.append({"name": display_name, "error": str(exc)})
+    finally:
+        # 每次 asyncio.run 结束前关闭本循环的会话，避免连接池泄漏到下一次运行
+        await close_session()
 
     if not summary:
         print("未抓取到任何公众号。")
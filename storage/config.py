@@ -1,2 +1,4 @@
 import os
 DATABASE_PATH = os.getenv("CRAWLER_DB_PATH", "./data/crawler.db")
+RETRY_BASE_DELAY = int(os.getenv("RETRY_BASE_DELAY", "60"))     # 失败记录首次重试退避（秒）
+RETRY_MAX_DELAY = int(os.getenv("RETRY_MAX_DELAY", "3600"))    # 失败记录重试退避上限（秒）；长期失败的记录约按此间隔重试，可调大以减少无效重试
@@ -7,14 +7,14 @@ from __future__ import annotations  # 兼容未来类型注解语法
 
 import json
 import glob
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 import sqlite3  # 标准库SQLite操作
 from contextlib import contextmanager  # 上下文管理器，简化连接关闭
 from pathlib import Path  # 路径处理
 from typing import Generator, Iterable, Optional  # 类型注解
 
-from storage.config import DATABASE_PATH  # 数据库文件路径配置
+from storage.config import DATABASE_PATH, RETRY_BASE_DELAY, RETRY_MAX_DELAY  # 数据库文件路径、失败记录重试退避配置
 
 # 数据库表结构定义，包含爬取记录所有字段
 SCHEMA = """
@@ -30,8 +30,24 @@ CREATE TABLE IF NOT EXISTS crawled_records (
     created_at TEXT DEFAULT CURRENT_TIMESTAMP -- 创建时间
 );
 CREATE INDEX IF NOT EXISTS idx_crawled_records_url ON crawled_records(url); -- 加速URL查询
+CREATE TABLE IF NOT EXISTS ocr_cache (
+    sha256 TEXT PRIMARY KEY,          -- 图片内容SHA-256
+    text TEXT NOT NULL,               -- OCR识别结果（可为空串，表示已识别但无文字）
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP -- 创建时间
+);
+CREATE TABLE IF NOT EXISTS failed_record_retries (
+    id TEXT PRIMARY KEY,              -- 对应 crawled_records.id
+    failure_count INTEGER NOT NULL DEFAULT 0, -- 连续重试失败次数
+    next_retry_at TEXT                -- 下次允许重试的时间（UTC）
+);
 """
 
+
+def _utc_now_str(offset_seconds: int = 0) -> str:
+    """返回UTC时间字符串（与 CURRENT_TIMESTAMP 格式一致，可直接按字符串比较）。"""
+    moment = datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
 def query_records(source_ids: list, start_time: str, end_time: str) -> list:
     """
     查询指定 source_ids（列表）相关的所有记录，时间范围为 start_time 到 end_time。
@@ -113,16 +129,19 @@ def get_failed_records() -> list[dict]:
 def get_failed_wechat_records() -> list[dict]:
     """
     查询所有标题或正文为空的微信公众号文章记录。
-    仅针对 source_id 以 'wechat_' 开头的记录。
+    仅针对 source_id 以 'wechat_' 开头的记录，且跳过尚未到重试时间的记录。
     """
     with sqlite3.connect(DATABASE_PATH) as conn:
         cursor = conn.execute(
             """
-            SELECT id, url, source_id, source_name, publish_time, title
-            FROM crawled_records
-            WHERE source_id LIKE 'wechat_%'
-              AND ((title IS NULL OR title = '') OR (content IS NULL OR content = ''))
-            """
+            SELECT c.id, c.url, c.source_id, c.source_name, c.publish_time, c.title
+            FROM crawled_records AS c
+            LEFT JOIN failed_record_retries AS r ON r.id = c.id
+            WHERE c.source_id LIKE 'wechat_%'
+              AND ((c.title IS NULL OR c.title = '') OR (c.content IS NULL OR c.content = ''))
+              AND (r.next_retry_at IS NULL OR r.next_retry_at <= ?)
+            """,
+            (_utc_now_str(),),
         )
         results = []
         for row in cursor.fetchall():
@@ -173,6 +192,48 @@ def record_exists(record_id: str, url: Optional[str] = None) -> bool:
         # 所有匹配记录都为空，允许覆盖
         return False
 
+def get_all_ids(source_id: str) -> set[str]:
+    """
+    一次性取出指定来源下所有有效记录（标题和正文均非空）的ID集合。
+    供爬虫在内存中做去重判断，免去逐条 record_exists 查询；
+    与 record_exists 的策略A一致，内容为空的记录不计入，允许覆盖。
+    """
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        cursor = conn.execute(
+            """
+            SELECT id FROM crawled_records
+            WHERE source_id = ?
+              AND title IS NOT NULL AND title != ''
+              AND content IS NOT NULL AND content != ''
+            """,
+            (source_id,),
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+def existing_ids(ids: Iterable[str]) -> set[str]:
+    """
+    批量查询给定ID中已有效入库（标题和正文均非空）的ID集合。
+    与 record_exists 的策略A一致；按批拼接 IN 查询，避免超出SQLite参数上限。
+    """
+    id_list = list(dict.fromkeys(ids))
+    found: set[str] = set()
+    if not id_list:
+        return found
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        for start in range(0, len(id_list), 500):
+            chunk = id_list[start:start + 500]
+            cursor = conn.execute(
+                f"""
+                SELECT id FROM crawled_records
+                WHERE id IN ({','.join(['?'] * len(chunk))})
+                  AND title IS NOT NULL AND title != ''
+                  AND content IS NOT NULL AND content != ''
+                """,
+                chunk,
+            )
+            found.update(row[0] for row in cursor.fetchall())
+    return found
+
 def delete_record(record_id: str) -> None:
     """
     根据ID删除记录。
@@ -180,8 +241,57 @@ def delete_record(record_id: str) -> None:
     """
     with sqlite3.connect(DATABASE_PATH) as conn:
         conn.execute("DELETE FROM crawled_records WHERE id=?", (record_id,))
+        conn.execute("DELETE FROM failed_record_retries WHERE id=?", (record_id,))
         conn.commit()
 
+def mark_retry_failed(record_id: str) -> None:
+    """
+    记录一次失败的重试：失败次数加一，并按指数退避推迟下次重试时间
+    （min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**失败次数)）。
+    记录已被删除时不做任何操作。
+    """
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        row = conn.execute(
+            "SELECT failure_count FROM failed_record_retries WHERE id=?", (record_id,)
+        ).fetchone()
+        failure_count = (row[0] if row else 0) + 1
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** failure_count)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO failed_record_retries (id, failure_count, next_retry_at)
+            SELECT id, ?, ? FROM crawled_records WHERE id=?
+            """,
+            (failure_count, _utc_now_str(delay), record_id),
+        )
+        conn.commit()
+
+def clear_retry_state(record_id: str) -> None:
+    """
+    清除记录的重试退避状态（重试成功后调用）。
+    """
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        conn.execute("DELETE FROM failed_record_retries WHERE id=?", (record_id,))
+        conn.commit()
+
+_INSERT_RECORD_SQL = """
+    INSERT OR REPLACE INTO crawled_records
+    (id, title, url, publish_time, source_id, source_name, attachments, content)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _record_params(item_id: str, content: str, metadata: dict) -> tuple:
+    """将 (ID, 内容, 元数据) 转为 INSERT 语句参数。"""
+    return (
+        item_id,
+        metadata.get("title") or "",
+        metadata.get("url", ""),
+        metadata.get("publish_time"),
+        metadata.get("source_id", ""),
+        metadata.get("source_name", ""),
+        metadata.get("attachments"),
+        content,
+    )
+
 def store_document(item_id: str, content: str, metadata: dict) -> None:
     """
     存储文档内容及元数据到本地SQLite。
@@ -190,21 +300,34 @@ def store_document(item_id: str, content: str, metadata: dict) -> None:
     metadata: 需包含 title, url, publish_time, source_id, source_name, attachments (JSON字符串)
     """
     with sqlite3.connect(DATABASE_PATH) as conn:
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO crawled_records
-            (id, title, url, publish_time, source_id, source_name, attachments, content)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                item_id,
-                metadata.get("title", ""),
-                metadata.get("url", ""),
-                metadata.get("publish_time"),
-                metadata.get("source_id", ""),
-                metadata.get("source_name", ""),
-                metadata.get("attachments"),
-                content,
-            ),
-        )
+        conn.execute(_INSERT_RECORD_SQL, _record_params(item_id, content, metadata))
+        conn.commit()
+
+def store_documents_bulk(rows: Iterable[tuple[str, str, dict]]) -> None:
+    """
+    批量存储文档，所有记录在同一个事务中写入，只提交一次。
+    rows: (item_id, content, metadata) 三元组序列，字段要求同 store_document。
+    """
+    params = [_record_params(item_id, content, metadata) for item_id, content, metadata in rows]
+    if not params:
+        return
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        conn.executemany(_INSERT_RECORD_SQL, params)
+        conn.commit()
+
+def get_ocr_text(sha256: str) -> Optional[str]:
+    """
+    按图片内容哈希查询OCR缓存。
+    命中返回识别文本（可能为空串），未命中返回None。
+    """
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        row = conn.execute("SELECT text FROM ocr_cache WHERE sha256=?", (sha256,)).fetchone()
+        return row[0] if row else None
+
+def put_ocr_text(sha256: str, text: str) -> None:
+    """
+    写入图片内容哈希对应的OCR结果。
+    """
+    with sqlite3.connect(DATABASE_PATH) as conn:
+        conn.execute("INSERT OR REPLACE INTO ocr_cache (sha256, text) VALUES (?, ?)", (sha256, text))
         conn.commit()
@@ -3,15 +3,35 @@ import json
 import os
 import sys
 import base64
+import re
+from functools import lru_cache
 from curl_cffi import requests as curl_requests
 from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 from urllib.parse import urljoin, urlparse, parse_qs
 
+# 与爬虫共用同一套解析/选择器/文本提取实现，避免两份代码各自演化
+from common.parsing import (
+    node_text as _get_text,
+    parse_html as _parse_html,
+    select as _select,
+    select_one as _select_one,
+)
+
 # 默认测试配置
 DEFAULT_CONFIG_FILE = "config/sources/sxxy.json"
 
+@lru_cache(maxsize=1024)
+def _join(base_url: str, href):
+    """缓存的 urljoin：绝对地址直接返回，图库等大量同前缀的相对路径只解析一次"""
+    if href and href.startswith(("http://", "https://")):
+        return href
+    return urljoin(base_url, href)
+
 def base64_encode(s):
-    return base64.b64encode(str(s).encode('utf-8')).decode('utf-8')
+    raw = s if isinstance(s, (bytes, bytearray, memoryview)) else str(s).encode('utf-8')
+    # Base64 输出只含 ASCII 字符，用 ascii 解码更快
+    return base64.b64encode(raw).decode('ascii')
 
 async def fetch_api(url: str, payload: dict, headers: dict):
     print(f"正在请求 API: {url} ...")
@@ -27,14 +47,18 @@ async def fetch_api(url: str, payload: dict, headers: dict):
         print(f"状态码: {response.status_code}")
         return response.json()
 
+def _read_text_file(file_path: str) -> str:
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
 async def fetch_html(url: str, headers: dict = None):
     # 支持本地文件路径 (以 file:// 开头或绝对路径)
     if url.startswith("file://") or os.path.exists(url):
         file_path = url.replace("file://", "")
         print(f"正在读取本地文件: {file_path} ...")
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+            # 在线程中读取，避免大文件阻塞事件循环
+            return await asyncio.to_thread(_read_text_file, file_path)
         except Exception as e:
             print(f"读取文件失败: {e}")
             return ""
@@ -49,6 +73,46 @@ async def fetch_html(url: str, headers: dict = None):
             print(response.text)
         return response.text
 
+_CHARSET_PATTERN = re.compile(r"charset=[\"']?([\w-]+)", re.IGNORECASE)
+
+async def fetch_tree(url: str, headers: dict = None):
+    """流式抓取页面，边接收边喂给 lxml 解析器，不再同时持有完整响应文本和文档树"""
+    if url.startswith("file://") or os.path.exists(url):
+        return _parse_html(await fetch_html(url, headers))
+
+    print(f"正在流式抓取: {url} ...")
+    async with curl_requests.AsyncSession(impersonate="chrome120", headers=headers) as session:
+        async with session.stream("GET", url) as response:
+            status = response.status_code
+            print(f"状态码: {status}")
+            # 仅在响应头声明了编码时指定，否则交给 libxml2 按 <meta charset> 自动识别
+            charset = _CHARSET_PATTERN.search(response.headers.get("content-type") or "")
+            encoding = charset.group(1) if charset else None
+            parser = lxml_html.HTMLParser(encoding=encoding)
+            ok = 200 <= status < 300
+            head = bytearray()  # 只保留前 1000 字节，供错误页/过短响应的调试输出
+            received = 0
+            async for chunk in response.aiter_content():
+                if len(head) < 1000:
+                    head += chunk[:1000 - len(head)]
+                received += len(chunk)
+                # 错误页不解析，避免被当作空的详情页静默处理
+                if ok:
+                    parser.feed(chunk)
+    # 调试：请求失败或抓取到的内容过短，可能是反爬或动态加载
+    if not ok:
+        print(f"警告: 请求失败 (状态码 {status})")
+    if received < 1000:
+        print(f"警告: 响应内容过短 ({received} 字节)")
+    if not ok or received < 1000:
+        print(head.decode(encoding or "utf-8", errors="replace"))
+    if not ok:
+        return lxml_html.Element("html")
+    try:
+        return parser.close()
+    except etree.LxmlError:
+        return lxml_html.Element("html")
+
 def test_list_page(html: str, selectors: dict, base_url: str):
     print("\n--- 测试列表页解析 ---")
     soup = BeautifulSoup(html, "lxml")
@@ -84,16 +148,21 @@ def test_list_page(html: str, selectors: dict, base_url: str):
             return link
     return None
 
-def test_detail_page(html: str, detail_selectors: list, base_url: str):
+def build_detail_map(detail_selectors: list) -> dict:
+    """按 base_url 建立详情页配置索引，较长的 base_url 排在前面，保证最长匹配优先"""
+    detail_map = {}
+    for cfg in detail_selectors:
+        if cfg.get("base_url"):
+            # 重复的 base_url 保留最先出现的配置，与原先按顺序首个匹配的行为一致
+            detail_map.setdefault(cfg["base_url"], cfg)
+    # sorted 是稳定排序，等长的 base_url 仍保持配置文件中的先后顺序
+    return dict(sorted(detail_map.items(), key=lambda kv: len(kv[0]), reverse=True))
+
+def test_detail_page(tree, detail_map: dict, base_url: str):
     print("\n--- 测试详情页解析 ---")
-    soup = BeautifulSoup(html, "lxml")
     
     # 查找匹配的详情页配置
-    selector_cfg = None
-    for cfg in detail_selectors:
-        if cfg.get("base_url") in base_url:
-            selector_cfg = cfg
-            break
+    selector_cfg = next((cfg for url, cfg in detail_map.items() if base_url.startswith(url)), None)
     
     if not selector_cfg:
         print(f"未找到匹配 base_url '{base_url}' 的详情页配置")
@@ -104,11 +173,11 @@ def test_detail_page(html: str, detail_selectors: list, base_url: str):
         content_sel = selector_cfg["text_selector"].get("content")
         container_sel = selector_cfg["text_selector"].get("item_container")
         
-        container = soup.select_one(container_sel) if container_sel else soup
-        if container:
-            content_el = container.select_one(content_sel)
-            if content_el:
-                text = content_el.get_text(strip=True)[:100] + "..." 
+        container = _select_one(tree, container_sel) if container_sel else tree
+        if container is not None:
+            content_el = _select_one(container, content_sel)
+            if content_el is not None:
+                text = _get_text(content_el)[:100] + "..." 
                 print(f"正文预览: {text}")
             else:
                 print("未找到正文内容元素")
@@ -119,9 +188,9 @@ def test_detail_page(html: str, detail_selectors: list, base_url: str):
     if "meta_selector" in selector_cfg:
         pub_sel = selector_cfg["meta_selector"].get("publisher")
         if pub_sel:
-            pub_el = soup.select_one(pub_sel)
-            if pub_el:
-                print(f"发布信息: {pub_el.get_text(strip=True)}")
+            pub_el = _select_one(tree, pub_sel)
+            if pub_el is not None:
+                print(f"发布信息: {_get_text(pub_el)}")
             else:
                 print("未找到发布信息")
 
@@ -129,54 +198,53 @@ def test_detail_page(html: str, detail_selectors: list, base_url: str):
     if "img_selector" in selector_cfg:
         img_sel = selector_cfg["img_selector"].get("images")
         if img_sel:
-            images = soup.select(img_sel)
+            images = _select(tree, img_sel)
             print(f"找到 {len(images)} 张图片")
             for i, img in enumerate(images[:5]):
                 src = img.get('src')
-                print(f"图片 {i+1}: {urljoin(base_url,src)}")
+                print(f"图片 {i+1}: {_join(base_url, src)}")
 
     # 提取 PDF 链接
     if "embedded_pdf_selector" in selector_cfg:
         files_sel = selector_cfg["embedded_pdf_selector"].get("download_link")
         if files_sel:
-            files = soup.select(files_sel)
+            files = _select(tree, files_sel)
             print(f"找到 {len(files)} 份PDF")
             for i, el in enumerate(files[:5]):
                 pdf_url = None
                 # iframe: 从src的file参数解析
-                if el.name == "iframe":
+                if el.tag == "iframe":
                     src = el.get("src")
                     if src:
                         parsed = urlparse(src)
                         q = parse_qs(parsed.query)
                         file_param = q.get("file")
                         if file_param:
-                            pdf_url = urljoin(base_url, file_param[0])
+                            pdf_url = _join(base_url, file_param[0])
                         else:
-                            pdf_url = urljoin(base_url, src)
+                            pdf_url = _join(base_url, src)
                 # script: 从文本匹配 showVsbpdfIframe("/path.pdf", ...)
-                elif el.name == "script":
-                    content = el.string or el.get_text() or ""
-                    import re
+                elif el.tag == "script":
+                    content = el.text or ""
                     m = re.search(r"showVsbpdfIframe\([\"']([^\"']+?\.pdf)[\"']", content)
                     if m:
-                        pdf_url = urljoin(base_url, m.group(1))
-                elif el.name == "a":
+                        pdf_url = _join(base_url, m.group(1))
+                elif el.tag == "a":
                     href = el.get("href") or el.get("src")
                     if href and href.endswith(".pdf"):
-                        pdf_url = urljoin(base_url, href)
+                        pdf_url = _join(base_url, href)
                 print(f"PDF {i+1}: {pdf_url}")
 
     # 提取 DOC/DOCX 链接
     if "doc_selector" in selector_cfg:
         files_sel = selector_cfg["doc_selector"].get("files")
         if files_sel:
-            files = soup.select(files_sel)
+            files = _select(tree, files_sel)
             print(f"找到 {len(files)} 份DOC/DOCX")
             for i, a in enumerate(files[:5]):
                 href = a.get("href") or a.get("src")
-                name = a.get_text(strip=True)
-                print(f"DOC/DOCX {i+1}: {urljoin(base_url,href)}")
+                name = _get_text(a)
+                print(f"DOC/DOCX {i+1}: {_join(base_url, href)}")
 
 def test_wechat_page(html: str):
     print("\n--- 测试微信公众号文章解析 ---")
@@ -291,6 +359,7 @@ async def main():
         sources_to_test = config_data.get("sources", [])
 
     print(f"将测试 {len(sources_to_test)} 个源")
+    detail_map = build_detail_map(config_data.get("detail_selectors", []))
 
     for source in sources_to_test:
         print(f"\n{'='*50}")
@@ -316,7 +385,8 @@ async def main():
                 # HTML 模式测试
                 list_url = source["list_url"]
                 html = await fetch_html(list_url, headers)
-                first_link = test_list_page(html, source["selectors"], source["base_url"])
+                # HTML 解析放到线程池执行，避免阻塞事件循环上的网络请求
+                first_link = await asyncio.to_thread(test_list_page, html, source["selectors"], source["base_url"])
 
             # 测试详情页 (如果列表页解析成功且有链接)
             if first_link:
@@ -330,12 +400,12 @@ async def main():
                     req_headers.pop("host", None)
                     req_headers.pop("Host", None)
 
-                detail_html = await fetch_html(first_link, req_headers)
-                
                 if "mp.weixin.qq.com" in first_link:
-                    test_wechat_page(detail_html)
+                    detail_html = await fetch_html(first_link, req_headers)
+                    await asyncio.to_thread(test_wechat_page, detail_html)
                 else:
-                    test_detail_page(detail_html, config_data.get("detail_selectors", []), source["base_url"])
+                    detail_tree = await fetch_tree(first_link, req_headers)
+                    await asyncio.to_thread(test_detail_page, detail_tree, detail_map, source["base_url"])
             else:
                 print("\n未获取到有效链接，跳过详情页测试")
 
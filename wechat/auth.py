@@ -10,6 +10,11 @@ from selenium.webdriver.firefox.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+try:
+  import orjson
+except ImportError:  # pragma: no cover - 未安装时回退到标准库 json
+  orjson = None
+
 WX_LOGIN = "https://mp.weixin.qq.com/"
 WX_HOME = "https://mp.weixin.qq.com/cgi-bin/home"
 QR_SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'wx_login_qrcode.png')
@@ -18,9 +23,12 @@ QR_SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_JSON = os.path.join(PROJECT_ROOT, "cfg", "session.json")
 
+# WebDriverWait 默认 0.5s 轮询一次，登录流程改为 50ms 以缩短二维码就绪/跳转的感知延迟
+POLL_FREQUENCY = 0.05
+
 
 def wait_first_image_loaded(driver, timeout=20):
-  WebDriverWait(driver, timeout).until(
+  WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
     lambda d: d.execute_script(
       "const img=document.querySelector('img');return img && img.complete;")
   )
@@ -32,7 +40,7 @@ def find_qr_element(driver, timeout=20):
   ]
   for css in selectors:
     try:
-      el = WebDriverWait(driver, timeout).until(
+      el = WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
         EC.visibility_of_element_located((By.CSS_SELECTOR, css))
       )
       return el
@@ -71,28 +79,26 @@ def extract_token(driver) -> Optional[str]:
     return None
 
 
-def cookies_and_expiry(driver) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+def cookies_and_expiry(driver) -> Tuple[List[Dict[str, Any]], str, Optional[int]]:
+  """一次遍历同时得到 cookies 列表、Cookie 头字符串和最早过期时间。"""
   cookies = driver.get_cookies()
   expiry_ts = None
-  exp_list = []
+  pairs = []
   for c in cookies:
+    pairs.append(f"{c['name']}={c['value']}")
     if "expiry" in c:
       try:
-        exp_list.append(int(c["expiry"]))
+        exp = int(c["expiry"])
       except Exception:
-        pass
-  if exp_list:
-    expiry_ts = min(exp_list)
-  return cookies, expiry_ts
-
-
-def format_cookies_str(cookies: List[Dict[str, Any]]) -> str:
-  return "; ".join([f"{c['name']}={c['value']}" for c in cookies])
+        continue
+      if expiry_ts is None or exp < expiry_ts:
+        expiry_ts = exp
+  return cookies, "; ".join(pairs), expiry_ts
 
 
 def verify_logged_in(driver, timeout=20) -> bool:
   try:
-    WebDriverWait(driver, timeout).until(EC.url_contains("/cgi-bin/home"))
+    WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(EC.url_contains("/cgi-bin/home"))
     return True
   except Exception:
     return False
@@ -116,13 +122,12 @@ def get_cookies():
 
     print(f"[信息] 已保存二维码: {os.path.abspath(QR_SAVE_PATH)}，请扫描登录...")
 
-    WebDriverWait(driver, 180).until(
+    WebDriverWait(driver, 180, poll_frequency=POLL_FREQUENCY).until(
       lambda d: ("token=" in d.current_url) or ("/cgi-bin/home" in d.current_url)
     )
 
     token = extract_token(driver)
-    cookies, expiry_ts = cookies_and_expiry(driver)
-    cookies_str = format_cookies_str(cookies)
+    cookies, cookies_str, expiry_ts = cookies_and_expiry(driver)
     user_agent = driver.execute_script("return navigator.userAgent;")
 
     data = {
@@ -139,7 +144,10 @@ def get_cookies():
     }
     os.makedirs(os.path.dirname(OUTPUT_JSON), exist_ok=True)
     with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
-      json.dump(data, f, ensure_ascii=False, indent=2)
+      if orjson is not None:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8"))
+      else:
+        json.dump(data, f, ensure_ascii=False, indent=2)
 
     ok = verify_logged_in(driver, timeout=10)
     print(f"[结果] 登录成功: {ok}, token: {token}")
@@ -9,6 +9,11 @@ import os
 import json
 from typing import Dict, Any, List, Union
 
+try:
+    import orjson  # C 实现的 JSON 解析，比标准库快数倍
+except ImportError:  # pragma: no cover - 未安装时回退到标准库
+    orjson = None
+
 def _get_bool_env(name: str, default: bool) -> bool:
     """
     读取布尔型环境变量，支持多种写法（1/true/yes/on），无则返回默认值。
@@ -23,6 +28,7 @@ CRAWL_INTERVAL = int(os.getenv("CRAWL_INTERVAL", "3600"))  # 定时抓取间隔
 REQUEST_TIMEOUT = 30  # 单次请求超时时间（秒）
 MAX_RETRIES = 3       # 网络请求最大重试次数
 AUTO_CRAWL_ENABLED = _get_bool_env("AUTO_CRAWL_ENABLED", True)  # 是否启用定时自动抓取
+CRAWL_CONCURRENCY = int(os.getenv("WECHAT_CRAWL_CONCURRENCY", "8"))  # 定时抓取时同时处理的公众号数量；对微信的请求总量另由 services.ARTICLE_CONCURRENCY 限制
 
 VECTOR_SYNC_ENABLED = _get_bool_env("VECTOR_SYNC_ENABLED", True)  # 是否自动同步爬取内容到向量库
 
@@ -48,6 +54,8 @@ def _read_json(path: str) -> Union[Dict[str, Any], List[Any]]:
         raw = f.read().strip()
         if not raw:
             return {}
+        if orjson is not None:
+            return orjson.loads(raw)
         return json.loads(raw)
 
 
@@ -10,13 +10,14 @@ from contextlib import asynccontextmanager
 
 from .config import (
     AUTO_CRAWL_ENABLED,
+    CRAWL_CONCURRENCY,
     CRAWL_INTERVAL,
     WECHAT_SOURCES,
     ensure_session,
     has_valid_session,
 )
-from .services import crawl_wechat_source
-from storage.database import get_failed_wechat_records
+from .services import close_session, crawl_wechat_source
+from storage.database import clear_retry_state, get_failed_wechat_records, mark_retry_failed
 
 logger = logging.getLogger(__name__)
 
@@ -31,18 +32,24 @@ async def _crawl_all_wechat_sources_once() -> None:
             "Run scripts/wechat_setup.py to log in before retrying."
         )
         return
-    for source in WECHAT_SOURCES:
-        source_id = source.get("id")
-        try:
-            await crawl_wechat_source(source_id)
-            logger.info("Periodic wechat crawl finished for source %s", source_id)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Periodic wechat crawl failed for source %s: %s", source_id, exc)
+    # 各公众号互相独立，并发抓取；信号量限制同时进行的源数量。
+    # 文章列表与文章详情请求都经过 services 中按事件循环共享的信号量，源并发不会放大对微信的请求量
+    semaphore = asyncio.Semaphore(max(1, CRAWL_CONCURRENCY))
+
+    async def _crawl_one(source_id: str) -> None:
+        async with semaphore:
+            try:
+                await crawl_wechat_source(source_id)
+                logger.info("Periodic wechat crawl finished for source %s", source_id)
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Periodic wechat crawl failed for source %s: %s", source_id, exc)
+
+    await asyncio.gather(*(_crawl_one(source.get("id")) for source in WECHAT_SOURCES))
     
     # Check for failed records
     failed_records = get_failed_wechat_records()
     if failed_records:
-        logger.warning("Found %d failed WeChat records (empty title or content). Starting retry...", len(failed_records))
+        logger.warning("Found %d failed WeChat records (empty title or content) due for retry.", len(failed_records))
         from .services import crawl_single_article
         
         for record in failed_records:
@@ -53,30 +60,23 @@ async def _crawl_all_wechat_sources_once() -> None:
             
             logger.info(f"Retrying failed record: {url}")
             
-            # Retry loop with max attempts to avoid infinite loops
-            max_retries = 3
-            for i in range(max_retries):
-                try:
-                    # Pass override_id to ensure we update the existing record slot
-                    # Pass delete_if_invalid=True to remove record if it's permanently deleted
-                    item = await crawl_single_article(url, source_id, source_name, override_id=rec_id, delete_if_invalid=True)
-                    
-                    if item and item.content and item.title:
-                        logger.info(f"Successfully repaired record: {url}")
-                        break
-                    
-                    # If item is None, it might have been deleted (and removed from DB) or just failed
-                    # If it was deleted, crawl_single_article would have removed it, so we can stop retrying
-                    # But we don't know for sure if it was removed unless we check or change return value.
-                    # However, if it returns None, we can't do much.
-                    # Let's check if record still exists to decide whether to continue retrying?
-                    # For now, just continue the loop. If it was deleted, subsequent retries will also fail/delete (idempotent).
-                    
-                    logger.warning(f"Retry {i+1}/{max_retries} failed for {url}. Waiting 5s...")
-                    await asyncio.sleep(5)
-                except Exception as exc:
-                    logger.error(f"Exception during retry for {url}: {exc}")
-                    await asyncio.sleep(5)
+            # 每轮只尝试一次；失败则记录失败次数并指数退避，到期后才会再次被取出
+            try:
+                # Pass override_id to ensure we update the existing record slot
+                # Pass delete_if_invalid=True to remove record if it's permanently deleted
+                item = await crawl_single_article(url, source_id, source_name, override_id=rec_id, delete_if_invalid=True)
+                
+                if item and item.content and item.title:
+                    logger.info(f"Successfully repaired record: {url}")
+                    await asyncio.to_thread(clear_retry_state, rec_id)
+                    continue
+                
+                # If item is None, it might have been deleted (and removed from DB) or just failed.
+                # mark_retry_failed is a no-op for deleted records.
+                logger.warning(f"Retry failed for {url}; backing off.")
+            except Exception as exc:
+                logger.error(f"Exception during retry for {url}: {exc}")
+            await asyncio.to_thread(mark_retry_failed, rec_id)
     else:
         logger.info("No failed WeChat records found.")
 
@@ -87,8 +87,10 @@ async def _periodic_crawl_loop() -> None:
         start_time = asyncio.get_running_loop().time()
         await _crawl_all_wechat_sources_once()
         elapsed = asyncio.get_running_loop().time() - start_time
-        logger.info("WeChat crawl cycle finished in %.2f seconds. Sleeping for %s seconds...", elapsed, max(1, CRAWL_INTERVAL))
-        await asyncio.sleep(max(1, CRAWL_INTERVAL))
+        # 扣除本轮耗时，保证按固定节奏触发而不是累计漂移
+        sleep_for = max(1, CRAWL_INTERVAL - elapsed)
+        logger.info("WeChat crawl cycle finished in %.2f seconds. Sleeping for %.2f seconds...", elapsed, sleep_for)
+        await asyncio.sleep(sleep_for)
 
 
 @asynccontextmanager
@@ -118,3 +120,5 @@ async def wechat_lifespan(app: FastAPI):
             await _periodic_task
         logger.info("Stopped periodic wechat crawler task")
         _periodic_task = None
+    # 关闭微信专用的 HTTP 会话，释放连接池
+    await close_session()
@@ -1,26 +1,98 @@
 from __future__ import annotations
 
 import asyncio
-import hashlib
 import json
 import os
 import re
 import requests
+import weakref
 from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Dict, List, Optional
-from bs4 import BeautifulSoup
+from curl_cffi import requests as curl_requests
+from lxml import etree
+
+try:
+	import orjson  # C 实现的 JSON 编解码，比标准库快数倍
+except ImportError:  # pragma: no cover - 未安装时回退到标准库
+	orjson = None
 
 from .config import WECHAT_SOURCES, WECHAT_SESSION, REQUEST_TIMEOUT, SESSION_FILE
 from crawler.models import CrawlItem
+from common.hashing import compute_sha256
+from common.parsing import node_text as _text, parse_html
 from storage import database
 
-# reuse a requests Session like the original project
+# 请求头在模块加载时构建一次，各调用直接复用（只读映射，防止被意外修改）
+_UA = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+_UA_119 = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
+_REF = "https://mp.weixin.qq.com/"
+_HDR_FETCH = MappingProxyType({"User-Agent": _UA, "Referer": _REF})
+_HDR_DETAIL = MappingProxyType({"Referer": _REF, "User-Agent": _UA_119})
+
+# reuse a requests Session like the original project; headers are set once and never mutated per call
 Session = requests.Session()
+Session.headers.update(_HDR_DETAIL)
+
+
+@lru_cache(maxsize=32)
+def _wx_session(cookies_str: str, user_agent: str) -> requests.Session:
+	"""Return a cached requests Session preloaded with one login's Cookie / User-Agent headers."""
+	sess = requests.Session()
+	sess.headers.update({"Cookie": cookies_str, "User-Agent": user_agent})
+	return sess
+
+# 单次扫描即可取得发布时间 / biz / 删除与环境异常标记，避免对整页 HTML 多次线性搜索
+_MARKER_RE = re.compile(
+	r"var createTime\s*=\s*['\"](?P<createTime>[^'\"\n]*)['\"]"
+	r"|var ct\s*=\s*['\"](?P<ct>[^'\"\n]*)['\"]"
+	r"|var publish_time\s*=\s*['\"](?P<publish_time>[^'\"\n]*)['\"]"
+	r"|var biz\s*=\s*\"(?P<biz>.*?)\";"
+	r"|(?P<deleted>此内容已被发布者删除|此内容因违规无法查看|该内容已被发布者删除)"
+	r"|(?P<envexc>当前环境异常)"
+)
+# 删除 / 违规 / 环境异常标记的字节版本，可直接在未解码的响应体上搜索
+_REJECT_RE_B = re.compile(
+	"此内容已被发布者删除|此内容因违规无法查看|该内容已被发布者删除|当前环境异常".encode("utf-8")
+)
+# 换行及其两侧的空白（含连续空行）；\s 覆盖 &nbsp; / 全角空格，与 str.strip() 一致
+_CLEAN_RE = re.compile(r"[^\S\n]*\n\s*")
+# Content-Type 头或页面前 1024 字节中声明的字符集
+_CHARSET_RE = re.compile(rb"charset\s*=\s*[\"']?([A-Za-z0-9_\-]+)", re.IGNORECASE)
+# JSON 中转义的斜杠（\/ 或 \\/）
+_SLASH_RE = re.compile(r"\\+/")
+# 发布时间字段的优先级
+_TIME_KEYS = ("createTime", "ct", "publish_time")
+
+
+def _decode_body(resp: Any) -> str:
+	"""Decode a response body using the declared charset instead of chardet's full-body guess."""
+	content = resp.content
+	match = _CHARSET_RE.search((resp.headers.get("Content-Type") or "").encode("latin-1", "ignore"))
+	if match is None:
+		# 头部未声明时只嗅探 <meta charset> 所在的页首
+		match = _CHARSET_RE.search(content[:1024])
+	encoding = match.group(1).decode("ascii") if match else "utf-8"
+	try:
+		return content.decode(encoding, errors="replace")
+	except LookupError:
+		return content.decode("utf-8", errors="replace")
+
+
+def _scan_markers(html: str) -> Dict[str, str]:
+	"""Scan html once and return the first value seen for each marker group."""
+	found: Dict[str, str] = {}
+	for match in _MARKER_RE.finditer(html):
+		key = match.lastgroup
+		if key not in found:
+			found[key] = match.group(key)
+	return found
 
-_TIME_PATTERNS = (
-	re.compile(r"var createTime\s*=\s*['\"](.*?)['\"]"),
-	re.compile(r"var ct\s*=\s*['\"](.*?)['\"]"),
-	re.compile(r"var publish_time\s*=\s*['\"](.*?)['\"]"),
+
+_DT_RE = re.compile(
+	r"^(?P<y>\d{4})-(?P<m>\d{1,2})-(?P<d>\d{1,2})"
+	r"(?:[T ](?P<H>\d{1,2}):(?P<M>\d{1,2})(?::(?P<S>\d{1,2}))?)?$"
 )
 
 
@@ -37,12 +109,21 @@ def _parse_publish_timestamp(raw_value: str) -> Optional[datetime]:
 		return datetime.fromtimestamp(float(value), tz=timezone.utc)
 	except (ValueError, OSError):
 		pass
-	for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+	match = _DT_RE.match(value)
+	if match:
+		# 无时区的 "YYYY-MM-DD[ HH:MM[:SS]]" 直接按 UTC 构造，免去 strptime 的逐格式尝试
 		try:
-			dt = datetime.strptime(value, fmt)
-			return dt.replace(tzinfo=timezone.utc)
+			return datetime(
+				int(match["y"]),
+				int(match["m"]),
+				int(match["d"]),
+				int(match["H"] or 0),
+				int(match["M"] or 0),
+				int(match["S"] or 0),
+				tzinfo=timezone.utc,
+			)
 		except ValueError:
-			continue
+			return None
 	try:
 		dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
 		return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
@@ -50,13 +131,22 @@ def _parse_publish_timestamp(raw_value: str) -> Optional[datetime]:
 		return None
 
 
-def _extract_publish_datetime(html: str) -> tuple[Optional[datetime], Optional[str]]:
-	"""Extract publish datetime (if any) and return both parsed datetime and raw value."""
-	for pattern in _TIME_PATTERNS:
-		match = pattern.search(html)
-		if not match:
+def _midnight(dt: datetime) -> datetime:
+	"""Truncate a datetime to midnight, keeping its tzinfo."""
+	return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _today_utc() -> datetime:
+	"""Today's midnight in UTC (recomputed on every call so long-running crawls roll over correctly)."""
+	return _midnight(datetime.now(timezone.utc))
+
+
+def _extract_publish_datetime(scan: Dict[str, str]) -> tuple[Optional[datetime], Optional[str]]:
+	"""Extract publish datetime (if any) from a _scan_markers result and return both parsed datetime and raw value."""
+	for key in _TIME_KEYS:
+		if key not in scan:
 			continue
-		raw_value = match.group(1).strip()
+		raw_value = scan[key].strip()
 		parsed = _parse_publish_timestamp(raw_value)
 		if parsed:
 			return parsed, raw_value
@@ -64,6 +154,48 @@ def _extract_publish_datetime(html: str) -> tuple[Optional[datetime], Optional[s
 	return None, None
 
 
+# 按 class 单词匹配（等价于 CSS 的 .rich_media_content）
+_CONTENT_XPATH = etree.XPath(
+	"//div[contains(concat(' ', normalize-space(@class), ' '), ' rich_media_content ')]"
+)
+_JS_CONTENT_XPATH = etree.XPath("//div[@id='js_content']")
+_TITLE_XPATH = etree.XPath("//h1[contains(concat(' ', normalize-space(@class), ' '), ' rich_media_title ')]")
+_AUTHOR_XPATH = etree.XPath("//a[@id='js_name']")
+_BLOCK_TAGS = frozenset(("p", "section", "h1", "h2", "h3", "h4", "h5", "h6", "li", "div", "blockquote"))
+
+
+def _json_loads(data):
+	"""Decode JSON from str/bytes, preferring orjson when available."""
+	if orjson is not None:
+		return orjson.loads(data)
+	return json.loads(data)
+
+
+def _first(nodes: list):
+	return nodes[0] if nodes else None
+
+
+_META_XPATH = etree.XPath("//meta[@property or @name]")
+
+
+def _meta_maps(tree) -> tuple[Dict[str, str], Dict[str, str]]:
+	"""Map meta property and meta name to the content of their first occurrence, in one pass.
+
+	property 与 name 分开存放，按原逻辑各自查找，互不遮蔽。
+	"""
+	props: Dict[str, str] = {}
+	names: Dict[str, str] = {}
+	for node in _META_XPATH(tree):
+		content = node.get("content", "")
+		prop = node.get("property")
+		if prop and prop not in props:
+			props[prop] = content
+		name = node.get("name")
+		if name and name not in names:
+			names[name] = content
+	return props, names
+
+
 def upsert_session(payload: Dict[str, Any]) -> Dict[str, Any]:
 	"""Persist session payload to cfg/session.json and refresh in-memory session."""
 	if not isinstance(payload, dict):
@@ -83,134 +215,118 @@ def upsert_session(payload: Dict[str, Any]) -> Dict[str, Any]:
 			pass
 	os.makedirs(os.path.dirname(SESSION_FILE), exist_ok=True)
 	with open(SESSION_FILE, "w", encoding="utf-8") as fp:
-		json.dump(cleaned, fp, ensure_ascii=False, indent=2)
+		# 一次性序列化后单次写入，避免 json.dump 的大量小块 write()
+		if orjson is not None:
+			fp.write(orjson.dumps(cleaned, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode("utf-8"))
+		else:
+			fp.write(json.dumps(cleaned, ensure_ascii=False, indent=2))
 	WECHAT_SESSION.clear()
 	WECHAT_SESSION.update(cleaned)
 	return cleaned
 
 
-def compute_sha256(*segments: Optional[str]) -> str:
-	payload = "\n".join(segment or "" for segment in segments)
-	return hashlib.sha256(payload.encode("utf-8")).hexdigest()
-
-
 def format_wechat_content(content_div) -> str:
 	"""
 	Format WeChat article content to preserve structure and images.
 	Replaces <br> with newlines, handles images as markdown, and ensures paragraphs are separated.
 	"""
-	if not content_div:
+	if content_div is None:
 		return ""
-		
-	# 1. Replace <br> with newline
-	for br in content_div.find_all("br"):
-		br.replace_with("\n")
-		
-	# 2. Handle Images
-	for img in content_div.find_all("img"):
-		src = img.get("data-src") or img.get("src")
-		if src:
-			# Insert newline before and after image to ensure it's on its own line
-			img.replace_with(f"\n![图片]({src})\n")
-			
-	# 3. Handle Block Elements: Ensure they are separated by newlines
-	# Append a newline to block elements to ensure separation when text is extracted
-	for tag in content_div.find_all(["p", "section", "h1", "h2", "h3", "h4", "h5", "h6", "li", "div", "blockquote"]):
-		tag.append("\n")
-		
-	# 4. Get text with no separator (relying on our inserted newlines)
-	# We use strip=False to preserve the newlines we added, but we'll clean up later
-	text = content_div.get_text(separator="", strip=False)
+
+	# 单次遍历（不修改文档树）：<br> 输出换行，<img> 输出独占一行的 markdown 图片，块级元素结束时补换行
+	parts: List[str] = []
+	skip_until = None  # 正在跳过的 script/style 元素
+	for event, el in etree.iterwalk(content_div, events=("start", "end", "comment", "pi")):
+		if skip_until is not None:
+			if el is not skip_until:
+				continue
+			skip_until = None
+		# 注释 / 处理指令只产生一个事件，只保留其 tail 文本
+		if event == "comment" or event == "pi":
+			if el.tail:
+				parts.append(el.tail)
+			continue
+		tag = el.tag
+		is_element = isinstance(tag, str)
+		if event == "start":
+			if not is_element:
+				continue
+			if tag in ("script", "style"):
+				skip_until = el
+			elif tag == "br":
+				parts.append("\n")
+			elif tag == "img":
+				src = el.get("data-src") or el.get("src")
+				if src:
+					parts.append(f"\n![图片]({src})\n")
+			elif el.text:
+				parts.append(el.text)
+			continue
+		if el is content_div:
+			break
+		if is_element and tag in _BLOCK_TAGS:
+			parts.append("\n")
+		if el.tail:
+			parts.append(el.tail)
+	text = "".join(parts)
 	
 	# 5. Post-processing
-	# Split by lines, strip each line to remove excessive spaces (but keep the line structure)
-	lines = [line.strip() for line in text.split('\n')]
-	
-	# Remove empty lines
-	lines = [line for line in lines if line]
-	
-	# Join with single newline as requested
-	return "\n".join(lines)
+	# 一次正则替换完成：去掉每行首尾空白、删除空行、以单个换行连接
+	return _CLEAN_RE.sub("\n", text).strip()
 
 
 def parse_wechat_article(html: str) -> Dict[str, Any]:
 	"""Parse a WeChat article HTML and return aggregated text content."""
-	soup = BeautifulSoup(html, "lxml")
+	# 先在原始 HTML 上检查删除/环境异常标记，命中时无需构建文档树
+	scan = _scan_markers(html)
 
 	# Check for deleted content markers
-	if any(marker in html for marker in ["此内容已被发布者删除", "此内容因违规无法查看", "该内容已被发布者删除"]):
+	if "deleted" in scan:
 		return {"Error": "Content deleted", "Content": ""}
 
-	if "当前环境异常" in html:
+	if "envexc" in scan:
 		return {"Error": "WeChat environment exception (verification required)", "Content": ""}
 
-	content_div = soup.find("div", class_="rich_media_content")
-	if not content_div:
-		content_div = soup.find("div", id="js_content")
+	tree = parse_html(html)
+
+	content_div = _first(_CONTENT_XPATH(tree))
+	if content_div is None:
+		content_div = _first(_JS_CONTENT_XPATH(tree))
 	
 	# Use the new formatting function
 	content = format_wechat_content(content_div)
 
-	# Fallback for empty content (e.g. image only articles)
-	if not content:
-		# Try to get description from meta tags
-		desc_tag = soup.find("meta", property="og:description")
-		if desc_tag and desc_tag.get("content"):
-			import html as html_lib
-			content = html_lib.unescape(desc_tag.get("content"))
-		
-		# If still empty, try to get the main image
-		if not content:
-			img_tag = soup.find("meta", property="og:image")
-			if img_tag and img_tag.get("content"):
-				content = f"![封面图]({img_tag.get('content')})"
+	props, names = _meta_maps(tree)
 
+	# Fallback for empty content (e.g. image only articles or share/protected pages)
 	if not content:
-		# Fallback to meta description for share pages or protected pages
-		meta_desc = soup.find("meta", property="og:description")
-		if not meta_desc:
-			meta_desc = soup.find("meta", attrs={"name": "description"})
-		
-		content = meta_desc.get("content", "") if meta_desc else ""
-
-		# If content is still empty, try to get the cover image (for image-only share pages)
-		if not content:
-			og_image = soup.find("meta", property="og:image")
-			if not og_image:
-				# Try attrs search as fallback
-				og_image = soup.find("meta", attrs={"property": "og:image"})
-			
-			if og_image and og_image.get("content"):
-				content = f"【图片内容】\n![Image]({og_image.get('content')})"
-
-	title = soup.find("h1", class_="rich_media_title")
-	title_text = title.get_text(strip=True) if title else ""
+		if props.get("og:description"):
+			import html as html_lib
+			content = html_lib.unescape(props["og:description"])
+		elif props.get("og:image"):
+			# Image-only article: use the cover image
+			content = f"![封面图]({props['og:image']})"
+		elif "og:description" not in props:
+			content = names.get("description") or ""
+
+	title_text = _text(_first(_TITLE_XPATH(tree)))
 	
 	# Fallback for title
 	if not title_text:
-		og_title = soup.find("meta", property="og:title")
-		if og_title:
-			title_text = og_title.get("content", "")
-
-	if not title_text:
-		meta_title = soup.find("meta", property="og:title")
-		if meta_title:
-			title_text = meta_title.get("content", "")
+		title_text = props.get("og:title") or ""
 
-	author = soup.find("a", id="js_name")
-	author_text = author.get_text(strip=True) if author else ""
+	author_text = _text(_first(_AUTHOR_XPATH(tree)))
 
-	publish_dt, raw_time = _extract_publish_datetime(html)
+	publish_dt, _ = _extract_publish_datetime(scan)
 
 	meta: Dict[str, Any] = {}
 	if title_text:
 		meta["Title"]=title_text
 	if author_text:
 		meta["Author"]=author_text
+	# 只保存已解析的 datetime；无法解析的原始字符串对下游没有用处
 	if publish_dt:
 		meta["Time"] = publish_dt
-	elif raw_time:
-		meta["Time"] = raw_time
 	if content:
 		meta["Content"]=content
 	
@@ -236,14 +352,13 @@ def get_article_list(wx_cfg: dict, fakeid: str, count: int = 5) -> List[str]:
 		"f": "json",
 		"ajax": 1,
 	}
-	headers = {
-		"Cookie": wx_cfg.get("cookies_str", "") if wx_cfg else "",
-		"User-Agent": wx_cfg.get("user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"),
-	}
-	Session.headers.update(headers)
-	resp = Session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+	sess = _wx_session(
+		wx_cfg.get("cookies_str", "") if wx_cfg else "",
+		wx_cfg.get("user_agent", _UA),
+	)
+	resp = sess.get(url, params=params, timeout=REQUEST_TIMEOUT)
 	try:
-		data = resp.json()
+		data = _json_loads(resp.content)
 	except Exception:
 		return []
 
@@ -254,68 +369,50 @@ def get_article_list(wx_cfg: dict, fakeid: str, count: int = 5) -> List[str]:
 		if not publish_page:
 			continue
 		try:
-			page_obj = json.loads(publish_page)
+			page_obj = _json_loads(publish_page)
 		except Exception:
 			continue
 		for pub in page_obj.get("publish_list", []):
 			try:
-				info_obj = json.loads(pub.get("publish_info", "{}"))
+				info_obj = _json_loads(pub.get("publish_info", "{}"))
 			except Exception:
 				continue
 			for appmsg in info_obj.get("appmsgex", []):
 				link = appmsg.get("link")
 				if link:
-					link = link.replace("\\/", "/").replace("\\\\/", "/")
-					results.append(link)
+					results.append(_SLASH_RE.sub("/", link))
 	# 去重并保持顺序
-	seen = set()
-	uniq: List[str] = []
-	for u in results:
-		if u not in seen:
-			seen.add(u)
-			uniq.append(u)
-	return uniq
+	return list(dict.fromkeys(results))
 
 
 def fetch_article_details(url: str, timeout: int = REQUEST_TIMEOUT) -> dict:
 	"""同步获取单篇微信文章详情，返回字典（title, author, content, create_time, biz）。"""
-	headers = {
-		"Referer": "https://mp.weixin.qq.com/",
-		"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-	}
 	url = url.strip()
-	Session.headers.update(headers)
-	resp = Session.get(url, timeout=timeout, headers=headers)
+	resp = Session.get(url, timeout=timeout)
 	if resp.status_code != 200:
 		return {"status": 0}
-	resp.encoding = resp.apparent_encoding
-	if re.search(r"当前环境异常", resp.text):
+	# 先在原始字节上检查删除/环境异常标记，命中时无需解码整页
+	if _REJECT_RE_B.search(resp.content):
 		return {"status": 0}
-	html = resp.text
-	soup = BeautifulSoup(html, "lxml")
+	html = _decode_body(resp)
+	scan = _scan_markers(html)
+	tree = parse_html(html)
 	content = ""
 	try:
-		content_div = soup.find("div", class_="rich_media_content")
+		content_div = _first(_CONTENT_XPATH(tree))
 		content = format_wechat_content(content_div)
 	except Exception:
 		content = ""
-	title = ""
-	try:
-		title = soup.find("h1", {"class": "rich_media_title", "id": "activity-name"}).get_text(strip=True)
-	except Exception:
-		t = soup.find("h1", class_="rich_media_title")
-		title = t.get_text(strip=True) if t else ""
-	author = ""
-	try:
-		author = soup.find("a", {"id": "js_name"}).get_text(strip=True)
-	except Exception:
-		author = ""
+	title_nodes = _TITLE_XPATH(tree)
+	# 优先 id="activity-name" 的标题节点
+	title_node = next((t for t in title_nodes if t.get("id") == "activity-name"), _first(title_nodes))
+	title = _text(title_node)
+	author = _text(_first(_AUTHOR_XPATH(tree)))
 	biz = ""
-	m = re.search(r'var biz\s*=\s*"(.*?)";', html)
-	if m:
-		biz = m.group(1).replace('" || "', '').replace('"', '')
+	if "biz" in scan:
+		biz = scan["biz"].replace('" || "', '').replace('"', '')
 	create_time = ""
-	publish_dt, raw_time = _extract_publish_datetime(html)
+	publish_dt, raw_time = _extract_publish_datetime(scan)
 	if publish_dt:
 		create_time = publish_dt.strftime("%Y-%m-%d")
 	elif raw_time:
@@ -344,14 +441,13 @@ def get_fakeid_by_name(wx_cfg: dict, kw: str) -> Optional[str]:
 		"f": "json",
 		"ajax": "1",
 	}
-	headers = {
-		"Cookie": wx_cfg.get("cookies_str", ""),
-		"User-Agent": wx_cfg.get("user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"),
-	}
-	Session.headers.update(headers)
-	resp = Session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+	sess = _wx_session(
+		wx_cfg.get("cookies_str", ""),
+		wx_cfg.get("user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"),
+	)
+	resp = sess.get(url, params=params, timeout=REQUEST_TIMEOUT)
 	try:
-		data = resp.json()
+		data = _json_loads(resp.content)
 	except Exception:
 		return None
 
@@ -362,25 +458,95 @@ def get_fakeid_by_name(wx_cfg: dict, kw: str) -> Optional[str]:
 		return None
 
 
+# 对微信请求（文章列表与文章详情）的并发上限，防止被封禁；同一事件循环内的所有 crawl_wechat_source 调用共享
+ARTICLE_CONCURRENCY = 3
+
+
+class _LoopState:
+	"""asyncio resources bound to one event loop: the article limiter, in-flight fetches and HTTP session."""
+
+	__slots__ = ("semaphore", "inflight", "session")
+
+	def __init__(self) -> None:
+		self.semaphore = asyncio.Semaphore(ARTICLE_CONCURRENCY)
+		# 正在进行中的抓取：同一 URL 的并发请求共享同一个下载任务
+		self.inflight: Dict[str, asyncio.Task] = {}
+		self.session: Optional[curl_requests.AsyncSession] = None
+
+
+# asyncio 原语会绑定到首次使用它们的事件循环；scripts 中多次 asyncio.run 时每个循环各用一份
+_LOOP_STATE: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _loop_state() -> _LoopState:
+	"""Return the resources of the running event loop, creating them on first use."""
+	loop = asyncio.get_running_loop()
+	state = _LOOP_STATE.get(loop)
+	if state is None:
+		state = _LOOP_STATE[loop] = _LoopState()
+	return state
+
+
+def get_session() -> curl_requests.AsyncSession:
+	"""Return the running loop's WeChat async session (keep-alive pool, TLS verified), creating it on first use."""
+	state = _loop_state()
+	if state.session is None:
+		state.session = curl_requests.AsyncSession(impersonate="chrome120", timeout=REQUEST_TIMEOUT)
+	return state.session
+
+
+async def close_session() -> None:
+	"""Close the running loop's WeChat session and drop its per-loop state (call when the lifespan or script run ends)."""
+	state = _LOOP_STATE.pop(asyncio.get_running_loop(), None)
+	if state is not None and state.session is not None:
+		await state.session.close()
+
+
 async def fetch_html(url: str, timeout: int = REQUEST_TIMEOUT) -> str:
-	"""Fetch HTML using requests in a thread to avoid blocking the event loop."""
-	def _get():
-		headers = {
-			"User-Agent": (
-				"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-				"(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-			),
-			"Referer": "https://mp.weixin.qq.com/",
-		}
-		resp = requests.get(url, headers=headers, timeout=timeout)
-		resp.raise_for_status()
-		resp.encoding = resp.apparent_encoding
-		return resp.text
-
-	return await asyncio.to_thread(_get)
+	"""Fetch HTML, coalescing concurrent requests for the same URL into one download."""
+	inflight = _loop_state().inflight
+	task = inflight.get(url)
+	if task is None:
+		task = asyncio.ensure_future(_fetch_html_once(url, timeout))
+		inflight[url] = task
+
+		def _forget(done: asyncio.Task) -> None:
+			if inflight.get(url) is done:
+				del inflight[url]
+
+		task.add_done_callback(_forget)
+	# shield：某个等待方被取消时不影响其他共享该任务的协程
+	return await asyncio.shield(task)
+
+
+async def _fetch_html_once(url: str, timeout: int = REQUEST_TIMEOUT) -> str:
+	"""Fetch HTML through the WeChat async session (keep-alive pool, no worker thread)."""
+	resp = await get_session().get(url, headers=_HDR_FETCH, timeout=timeout)
+	resp.raise_for_status()
+	return _decode_body(resp)
 
 
 async def crawl_single_article(url: str, source_id: Optional[str] = None, source_name: Optional[str] = None, override_id: Optional[str] = None, delete_if_invalid: bool = False) -> Optional[CrawlItem]:
+	built = await _build_article(url, source_id, source_name, override_id, delete_if_invalid)
+	if built is None:
+		return None
+	row, item = built
+	try:
+		await asyncio.to_thread(database.store_document, *row)
+	except Exception as exc:
+		print(f"[WARN] Failed to store wechat single article: {exc}")
+	return item
+
+
+async def _build_article(url: str, source_id: Optional[str] = None, source_name: Optional[str] = None, override_id: Optional[str] = None, delete_if_invalid: bool = False) -> Optional[tuple[tuple[str, str, dict], CrawlItem]]:
+	"""Fetch and parse one article; return its storage row (id, content, metadata) and CrawlItem without writing to the DB."""
+	item_id = override_id or compute_sha256(url)
+
+	# 先查库再联网：已入库的文章无需下载和解析
+	exists = await asyncio.to_thread(database.record_exists, item_id, url)
+	if exists:
+		return None
+
 	html = await fetch_html(url)
 	meta = parse_wechat_article(html)
 
@@ -394,31 +560,9 @@ async def crawl_single_article(url: str, source_id: Optional[str] = None, source
 	content = meta.get("Content", "")
 	title = meta.get("Title", "")
 	
-	# 确保 create_time 是 datetime 对象，且仅包含日期部分
+	# 确保 create_time 是 datetime 对象，且仅包含日期部分；解析阶段已得到 datetime，缺失时取当天
 	raw_time = meta.get("Time")
-	if isinstance(raw_time, str):
-		try:
-			# 尝试解析字符串时间，兼容带时分秒和不带时分秒的格式
-			clean_time = raw_time.strip()
-			if len(clean_time) <= 10:
-				dt = datetime.strptime(clean_time, "%Y-%m-%d")
-			else:
-				dt = datetime.strptime(clean_time, "%Y-%m-%d %H:%M:%S")
-			create_time = dt.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc)
-		except ValueError:
-			# 如果解析失败，使用当前时间并归零
-			create_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-	elif isinstance(raw_time, datetime):
-		create_time = raw_time.replace(hour=0, minute=0, second=0, microsecond=0)
-	else:
-		create_time = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-
-	item_id = override_id or compute_sha256(url)
-
-	exists = await asyncio.to_thread(database.record_exists, item_id, url)
-	if exists:
-		# Still return existing record shape but don't duplicate storage
-		return None
+	create_time = _midnight(raw_time) if isinstance(raw_time, datetime) else _today_utc()
 
 	# Determine storage source_id: prefer provided source_id, otherwise default to 'wechat_single'
 	store_source_id = source_id or "wechat_single"
@@ -432,12 +576,7 @@ async def crawl_single_article(url: str, source_id: Optional[str] = None, source
 		"attachments": None,
 	}
 
-	try:
-		await asyncio.to_thread(database.store_document, item_id, content, metadata)
-	except Exception as exc:
-		print(f"[WARN] Failed to store wechat single article: {exc}")
-
-	return CrawlItem(
+	item = CrawlItem(
 		id=item_id,
 		title=metadata["title"],
 		content=content,
@@ -447,6 +586,7 @@ async def crawl_single_article(url: str, source_id: Optional[str] = None, source
 		attachments=None,
 		extra_meta=None,
 	)
+	return (item_id, content, metadata), item
 
 
 async def crawl_wechat_source(source_id: str) -> List[CrawlItem]:
@@ -469,9 +609,20 @@ async def crawl_wechat_source(source_id: str) -> List[CrawlItem]:
 
 	results: List[CrawlItem] = []
 	
-	# 限制并发数，防止被微信封禁
-	semaphore = asyncio.Semaphore(3)
+	# 限制并发数，防止被微信封禁；与同一事件循环中的其他调用共享同一个信号量
+	semaphore = _loop_state().semaphore
 
+	async def process_url(src: dict, url: str):
+		async with semaphore:
+			try:
+				return await _build_article(url, source_id=src.get("id"), source_name=src.get('name'))
+			except Exception as exc:
+				print(f"[WARN] failed to crawl article {url}: {exc}")
+				return None
+
+	# 先收集所有源的待抓取文章，再统一并发执行，不同公众号之间可以并行
+	jobs: List[tuple[dict, str]] = []
+	queued: set = set()  # 已加入本批的链接，同一文章被多个源收录时只抓取一次
 	for src in targets:
 		urls: List[str] = []
 		# 优先支持 biz 模式
@@ -481,8 +632,9 @@ async def crawl_wechat_source(source_id: str) -> List[CrawlItem]:
 		count = int(src.get("count", 5)) if src.get("count") else 5
 		if biz:
 			try:
-				# get_article_list 是同步函数，放到线程池执行
-				urls = await asyncio.to_thread(get_article_list, wx_cfg, biz, count)
+				# get_article_list 是同步函数，放到线程池执行；与文章抓取共用同一个并发上限
+				async with semaphore:
+					urls = await asyncio.to_thread(get_article_list, wx_cfg, biz, count)
 			except Exception as exc:
 				print(f"[WARN] failed to get article list for {src.get('id')}: {exc}")
 				urls = []
@@ -493,27 +645,42 @@ async def crawl_wechat_source(source_id: str) -> List[CrawlItem]:
 			print(f"[INFO] wechat source {src.get('id')} has no article urls; skip")
 			continue
 
-		# 定义并发任务包装器
-		async def process_url(url: str):
-			async with semaphore:
-				try:
-					return await crawl_single_article(url, source_id=src.get("id"), source_name=src.get('name'))
-				except Exception as exc:
-					print(f"[WARN] failed to crawl article {url}: {exc}")
-					return None
-
-		# 创建并执行任务
-		tasks = [process_url(url) for url in urls]
-		batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-		# 收集结果
-		new_items_count = 0
-		for res in batch_results:
-			if isinstance(res, CrawlItem):
-				results.append(res)
-				new_items_count += 1
-			elif isinstance(res, Exception):
-				print(f"[WARN] task failed: {res}")
-
-		print(f"\n[SUCCESS] Source '公众号：{src.get('name')}' crawled successfully. {new_items_count} new items added.")
+		# 一次查询过滤掉已入库的文章，避免逐篇查库
+		url_ids = {url: compute_sha256(url) for url in urls}
+		stored = await asyncio.to_thread(database.existing_ids, url_ids.values())
+		urls = [url for url in dict.fromkeys(urls) if url_ids[url] not in stored and url not in queued]
+		if not urls:
+			print(f"[INFO] wechat source {src.get('id')} has no new articles; skip")
+			continue
+
+		queued.update(urls)
+		jobs.extend((src, url) for url in urls)
+
+	if not jobs:
+		return results
+
+	batch_results = await asyncio.gather(*(process_url(src, url) for src, url in jobs), return_exceptions=True)
+
+	# 收集结果，按源统计新增数量
+	new_counts: Dict[int, int] = {}
+	rows: List[tuple[str, str, dict]] = []
+	for (src, _), res in zip(jobs, batch_results):
+		new_counts.setdefault(id(src), 0)
+		if isinstance(res, tuple):
+			row, item = res
+			rows.append(row)
+			results.append(item)
+			new_counts[id(src)] += 1
+		elif isinstance(res, Exception):
+			print(f"[WARN] task failed: {res}")
+
+	# 本批文章在一个事务内批量入库
+	try:
+		await asyncio.to_thread(database.store_documents_bulk, rows)
+	except Exception as exc:
+		print(f"[WARN] Failed to store {len(rows)} wechat articles: {exc}")
+
+	for src in targets:
+		if id(src) in new_counts:
+			print(f"\n[SUCCESS] Source '公众号：{src.get('name')}' crawled successfully. {new_counts[id(src)]} new items added.")
 	return results
\ No newline at end of file